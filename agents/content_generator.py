@@ -10,6 +10,19 @@ from utils.llm_client import LLMClient
 # MCP client import moved to __init__ method
 import json
 
+# Splits an article in front of each H2 heading ("## "), keeping the heading with its section
+_H2_SECTION_RE = re.compile(r'(?m)^(?=## )')
+
+# Heading words shorter than this (a, of, the, how...) are ignored when matching instructions to sections
+_MIN_HEADING_WORD_LEN = 4
+
+# Significant heading words an instruction must all contain to target a section without quoting its heading
+_MIN_HEADING_WORDS_MATCHED = 2
+
+# Section-only refinement is skipped when the article is further than this from the
+# target word count, since resizing the whole article needs every section
+SECTION_REFINE_LENGTH_TOLERANCE = 0.15
+
 class ContentGeneratorAgent:
     """
     Advanced content generation agent with REST API integration for real-time data
@@ -243,8 +256,11 @@ class ContentGeneratorAgent:
         research = {}
         
         try:
-            # Get current SERP data for competitive insights
-            serp_data = self.dataforseo_mcp.get_serp_analysis(keyword)
+            # SERP, related keywords and trends are independent, so they go to the server as one batch
+            bundle = self.dataforseo_mcp.gather_seo_bundle(keyword, limit=10)
+            
+            # Current SERP data for competitive insights
+            serp_data = bundle['serp']
             if serp_data:
                 research['competitor_insights'] = [
                     {
@@ -254,19 +270,16 @@ class ContentGeneratorAgent:
                     for item in serp_data[:3]
                 ]
             
-            # Get related keywords for semantic richness
-            related_keywords = self.dataforseo_mcp.get_keyword_suggestions(
-                keyword, 
-                limit=10
-            )
+            # Related keywords for semantic richness
+            related_keywords = bundle['keyword_suggestions']
             if related_keywords:
                 research['related_terms'] = [
                     kw.get('keyword', '') 
                     for kw in related_keywords[:5]
                 ]
             
-            # Get trends data for timely content
-            trends = self.dataforseo_mcp.get_trends_data([keyword])
+            # Trends data for timely content
+            trends = bundle['trends']
             if trends and trends.get('graph_data'):
                 # Check if trending up or down
                 data_points = trends['graph_data']
@@ -470,9 +483,71 @@ TONE & STYLE REQUIREMENTS:
     ) -> str:
         """Refine existing content based on user feedback"""
         
+        # Instructions naming specific H2 sections only send (and rewrite) those sections
+        sections = _H2_SECTION_RE.split(current_content)
+        targets = self._match_sections(sections, refinement_instruction)
+        h2_count = sum(1 for section in sections if section.startswith('## '))
+        current_words = len(current_content.split())
+        near_target = not target_word_count or abs(current_words - target_word_count) <= target_word_count * SECTION_REFINE_LENGTH_TOLERANCE
+        
+        if not targets or len(targets) == h2_count or not near_target:
+            return self._refine_text(current_content, refinement_instruction, keyword, target_word_count)
+        
+        for index in targets:
+            section = sections[index]
+            # Keep each section's share of the overall target length
+            section_target = round(target_word_count * len(section.split()) / current_words) if target_word_count else None
+            refined = self._refine_text(section, refinement_instruction, keyword, section_target, section=True)
+            if not refined.startswith('## '):
+                heading = section.splitlines()[0]
+                lines = refined.strip().splitlines()
+                # Drop the section's own heading if it came back at another level; sub-headings stay
+                if lines and lines[0].startswith('#') and lines[0].lstrip('#').strip() == heading[3:].strip():
+                    lines = lines[1:]
+                refined = f"{heading}\n\n" + "\n".join(lines).strip()
+            sections[index] = refined.rstrip() + "\n\n"
+        
+        return "".join(sections).strip()
+    
+    def _match_sections(self, sections: List[str], instruction: str) -> List[int]:
+        """
+        Indexes of the H2 sections the instruction names: it quotes the heading text, or contains
+        all of its significant words when there are at least _MIN_HEADING_WORDS_MATCHED of them
+        (one shared word like "what" or "benefits" is not a reference to a section)
+        """
+        tokens = re.findall(r'\w+', instruction.lower())
+        instruction_text = f" {' '.join(tokens)} "
+        instruction_words = set(tokens)
+        mentions_section = bool(instruction_words & {"section", "sections", "heading", "part"})
+        matches = []
+        
+        for index, section in enumerate(sections):
+            if not section.startswith('## '):
+                continue
+            words = re.findall(r'\w+', section.splitlines()[0].lower())
+            heading_words = {word for word in words if len(word) >= _MIN_HEADING_WORD_LEN}
+            # A one-word heading ("Conclusion") only counts as quoted when the instruction talks about a section
+            quoted = bool(words) and f" {' '.join(words)} " in instruction_text and (len(words) > 1 or mentions_section)
+            named = len(heading_words) >= _MIN_HEADING_WORDS_MATCHED and heading_words <= instruction_words
+            if quoted or named:
+                matches.append(index)
+        
+        return matches
+    
+    def _refine_text(
+        self,
+        current_content: str,
+        refinement_instruction: str,
+        keyword: str = "",
+        target_word_count: int = None,
+        section: bool = False
+    ) -> str:
+        """Send content (a whole article, or one section of it) to the LLM with the refinement instruction"""
+        
         word_count_instruction = f"\n\nTARGET WORD COUNT: {target_word_count} words\nIMPORTANT: You MUST adjust the content length to be approximately {target_word_count} words. If current content is shorter, expand it. If longer, condense it." if target_word_count else ""
+        scope = "one section of a longer article, keeping its ## heading" if section else "existing content"
         
-        prompt = f"""You are refining existing content based on user feedback.{word_count_instruction}
+        prompt = f"""You are refining {scope} based on user feedback.{word_count_instruction}
 
 CURRENT CONTENT:
 {current_content}
@@ -504,6 +579,8 @@ Provide the refined content:"""
             temperature=0.5
         )
         
+        if section:
+            return refined.strip()
         return self._post_process_content(refined, "", "")
     
     def suggest_improvements(self, content: str) -> List[str]:
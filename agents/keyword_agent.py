@@ -4,6 +4,10 @@ from utils.llm_client import LLMClient
 from mcp.client import DataForSEOMCP
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Upper bound on concurrent LLM requests made while enriching SERP results
+LLM_INSIGHT_WORKERS = 4
 
 class KeywordAgent:
     """
@@ -96,9 +100,13 @@ class KeywordAgent:
             
             print(f"📊 Retrieved {len(serp_results)} SERP results from MCP")
             
-            # Add AI insights for content gaps
-            for result in serp_results:
-                result["insights"] = self._analyze_content_gap(result, keyword)
+            # Add AI insights for content gaps - each result is an independent
+            # LLM request, so overlap them instead of waiting on each in turn
+            if serp_results:
+                with ThreadPoolExecutor(max_workers=min(LLM_INSIGHT_WORKERS, len(serp_results))) as executor:
+                    insights = executor.map(lambda result: self._analyze_content_gap(result, keyword), serp_results)
+                    for result, insight in zip(serp_results, insights):
+                        result["insights"] = insight
             
             return serp_results
             
@@ -241,6 +249,15 @@ class KeywordAgent:
             from utils.content_extractor import ContentExtractor
             extractor = ContentExtractor()
             
+            # DataForSEO's answer is used whichever way extraction goes (extra metrics or fallback),
+            # so it is fetched on a worker thread while Trafilatura runs
+            mcp_future = None
+            if enable_javascript:
+                print(f"🔄 Requesting additional metrics from DataForSEO...")
+                executor = ThreadPoolExecutor(max_workers=1)
+                mcp_future = executor.submit(self.dataforseo_mcp.get_content_analysis, url=url)
+                executor.shutdown(wait=False)
+            
             print(f"📊 Extracting content with Trafilatura (primary method)...")
             content_data = extractor.extract_content(url)
             
@@ -250,10 +267,9 @@ class KeywordAgent:
                 
                 # Optionally try to get additional metrics from DataForSEO
                 # (like Core Web Vitals, load time, etc.)
-                if enable_javascript:
+                if mcp_future is not None:
                     try:
-                        print(f"🔄 Attempting to get additional metrics from DataForSEO...")
-                        mcp_data = self.dataforseo_mcp.get_content_analysis(url=url)
+                        mcp_data = mcp_future.result()
                         
                         # If we get real data (not blocked), merge the metrics
                         if mcp_data and 'Robot Challenge' not in mcp_data.get('title', ''):
@@ -272,7 +288,10 @@ class KeywordAgent:
             else:
                 # If Trafilatura fails, try DataForSEO as fallback
                 print(f"⚠️ Trafilatura extraction failed, trying DataForSEO...")
-                content_data = self.dataforseo_mcp.get_content_analysis(url=url)
+                if mcp_future is not None:
+                    content_data = mcp_future.result()
+                else:
+                    content_data = self.dataforseo_mcp.get_content_analysis(url=url)
                 
                 if content_data:
                     content_data['extraction_method'] = 'dataforseo'
@@ -1,51 +1,135 @@
 import streamlit as st
 import pandas as pd
 from agents.keyword_agent import KeywordAgent
-from utils.export import export_to_csv, export_to_excel
+from agents.content_generator import ContentGeneratorAgent
+from utils.export import export_to_csv, export_to_excel, export_to_json, export_to_json_gzip, create_keyword_report
+from utils import session_store
 import os
 import json
+import hashlib
 import math
-import random
+import markdown
+import re
+from collections import deque
+from itertools import islice
 from dotenv import load_dotenv
-from urllib.parse import urlparse
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (Streamlit re-executes this file on every rerun; .env only needs parsing once per process)
+if not os.environ.get("_DOTENV_LOADED"):
+    load_dotenv(override=False)
+    os.environ["_DOTENV_LOADED"] = "1"
+
+# st.fragment (experimental_fragment before Streamlit 1.37) reruns only the decorated
+# function when one of its widgets changes; without it sections run as plain functions
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Optional scheme and www. prefix, then everything up to the first path/query/fragment delimiter
+_DOMAIN_RE = re.compile(r'^(?:https?://)?(?:www\.)?([^/?#]+)', re.IGNORECASE)
 
 def extract_domain_from_input(domain_input: str) -> str:
     """Extract clean domain from user input (handles URLs)"""
     if not domain_input:
         return ""
     
-    # Remove whitespace
-    domain_input = domain_input.strip()
-    
-    # If it looks like a URL, parse it
-    if domain_input.startswith(('http://', 'https://', 'www.')):
-        if domain_input.startswith('www.'):
-            domain_input = 'https://' + domain_input
-        
-        parsed = urlparse(domain_input)
-        domain = parsed.netloc
-        
-        # Remove www. prefix if present
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        
-        return domain
-    
-    # If it's already a clean domain, return as is
-    return domain_input
+    match = _DOMAIN_RE.match(domain_input.strip())
+    return match.group(1).lower() if match else ""
 
-# Page configuration
-st.set_page_config(
-    page_title="BMM SEO Agent",
-    page_icon="🔍",
-    layout="wide"
+# Display labels for the country/language pickers
+COUNTRY_LABELS = {
+    "us": "🇺🇸 United States",
+    "uk": "🇬🇧 United Kingdom",
+    "ca": "🇨🇦 Canada",
+    "au": "🇦🇺 Australia",
+    "in": "🇮🇳 India",
+    "de": "🇩🇪 Germany",
+    "fr": "🇫🇷 France",
+    "es": "🇪🇸 Spain",
+    "it": "🇮🇹 Italy",
+    "br": "🇧🇷 Brazil",
+    "jp": "🇯🇵 Japan"
+}
+
+LANGUAGE_LABELS = {
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "pt": "Portuguese",
+    "it": "Italian",
+    "ru": "Russian",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "zh": "Chinese",
+    "hi": "Hindi"
+}
+
+# Options for the content type pickers (Content Brief and Content Generator)
+CONTENT_TYPES = ("Blog Post", "Landing Page", "Product Page", "Guide/Tutorial", "Comparison Article")
+
+# OpenRouter models offered in the sidebar
+LLM_MODELS = (
+    "google/gemini-2.5-flash-lite",
+    "anthropic/claude-3-haiku",
+    "openai/gpt-4o-mini",
+    "meta-llama/llama-3.2-3b-instruct"
 )
 
-# Custom CSS
-st.markdown("""
+# Characters that are unsafe (or awkward) in download file names
+_FILENAME_UNSAFE_CHARS = str.maketrans({char: '_' for char in ' /\\?*:|"<>'})
+
+def filename_slug(text: str) -> str:
+    """Make user input safe to embed in a download file name"""
+    return text.strip().translate(_FILENAME_UNSAFE_CHARS)[:80]
+
+def bullets(items: list, limit: int = None) -> str:
+    """Markdown for up to `limit` items as '• item' lines, rendered as one element"""
+    return "  \n".join(f"• {item}" for item in items[:limit])
+
+# Latest chat messages kept in session state (and sent to the LLM as context);
+# the full log lives in the on-disk session store
+LLM_CONTEXT_TURNS = 10
+
+def recent_chat(limit: int) -> list:
+    """The last `limit` messages of the Content Generator chat history"""
+    history = st.session_state.chat_history
+    return list(islice(history, max(0, len(history) - limit), None))
+
+def add_chat_message(role: str, content: str):
+    """Append a message to the in-memory chat window and the session's chat log on disk"""
+    message = {'role': role, 'content': content}
+    st.session_state.chat_history.append(message)
+    session_store.append_chat_message(st.session_state.session_id, message)
+
+# Rows sent to the browser per table; larger result sets are only available via export
+DISPLAY_ROW_LIMIT = 500
+
+def downcast_int_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer columns to the smallest dtype that holds their values"""
+    int_columns = df.select_dtypes(include="integer").columns
+    if len(int_columns) == 0:
+        return df
+    return df.assign(**{col: pd.to_numeric(df[col], downcast="integer") for col in int_columns})
+
+def render_capped_dataframe(df: pd.DataFrame, export_hint: bool = False, **kwargs):
+    """Render at most DISPLAY_ROW_LIMIT rows of a DataFrame with st.dataframe"""
+    st.dataframe(downcast_int_columns(df.head(DISPLAY_ROW_LIMIT)), **kwargs)
+    
+    if len(df) > DISPLAY_ROW_LIMIT:
+        hint = " - export for the full data" if export_hint else ""
+        st.caption(f"Showing {DISPLAY_ROW_LIMIT:,} of {len(df):,} rows{hint}")
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def keywords_csv_export(df: pd.DataFrame) -> str:
+    """CSV export of a keywords DataFrame, computed once per distinct result set"""
+    return export_to_csv(df)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def keywords_excel_export(df: pd.DataFrame) -> bytes:
+    """Excel export of a keywords DataFrame, computed once per distinct result set"""
+    return export_to_excel(df)
+
+# Button styling injected on every run (Streamlit drops elements a run doesn't re-emit)
+APP_CSS = """
 <style>
     .stButton > button {
         background-color: #667eea;
@@ -60,29 +144,95 @@ st.markdown("""
         background-color: #764ba2;
         transform: translateY(-2px);
     }
-    .dataframe {
-        font-size: 14px;
-    }
-    .difficulty-easy {
-        background-color: #4caf50;
-        color: white;
-        padding: 4px 12px;
-        border-radius: 20px;
-    }
-    .difficulty-medium {
-        background-color: #ff9800;
-        color: white;
-        padding: 4px 12px;
-        border-radius: 20px;
-    }
-    .difficulty-hard {
-        background-color: #f44336;
-        color: white;
-        padding: 4px 12px;
-        border-radius: 20px;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def content_hash(text: str) -> str:
+    """Short digest of a generated article, used as its cache key"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def set_generated_content(content: str):
+    """Replace the generated article, refresh its hash and the backup copies in session state"""
+    generated = st.session_state.generated_content
+    generated['content'] = content
+    generated['content_hash'] = content_hash(content)
+    st.session_state['content_backup'] = content
+    st.session_state['metadata_backup'] = generated.get('metadata', {})
+
+def generated_content_hash() -> str:
+    """Hash of the current generated article (computed if it was stored without one)"""
+    generated = st.session_state.generated_content
+    if 'content_hash' not in generated:
+        generated['content_hash'] = content_hash(generated['content'])
+    return generated['content_hash']
+
+@st.cache_resource(show_spinner=False)
+def get_content_generator() -> ContentGeneratorAgent:
+    """Shared ContentGeneratorAgent (stateless between calls, so one instance serves every click)"""
+    return ContentGeneratorAgent()
+
+# Markdown heading and emphasis markers dropped from the plain-text download
+_MD_STRIP_TABLE = str.maketrans('', '', '#*')
+
+# Keyed on the article hash; the leading underscore keeps Streamlit from hashing the full text on every rerun.
+# The encoded files live once in this cache rather than next to the text in every session's state.
+@st.cache_data(show_spinner=False, max_entries=16)
+def content_download_bytes(text_hash: str, _md_text: str) -> tuple:
+    """Markdown, plain-text and HTML download files of generated content, encoded once per distinct text"""
+    return (
+        _md_text.encode('utf-8'),
+        _md_text.translate(_MD_STRIP_TABLE).encode('utf-8'),
+        markdown.markdown(_md_text).encode('utf-8')
+    )
+
+# Icons for the improvement-suggestion areas, checked in this order (an SEO suggestion stays SEO
+# even when it also mentions structure); only "audience" is matched regardless of case
+_SUGGESTION_ICONS = (
+    (re.compile(r'\bSEO\b'), "🔍"),
+    (re.compile(r'\bReadability\b'), "📖"),
+    (re.compile(r'\bStructure\b'), "🏗️"),
+    (re.compile(r'\bCall-to-action\b|\bCTA\b'), "🎯"),
+    (re.compile(r'\baudiences?\b', re.IGNORECASE), "👥")
+)
+
+def suggestion_icon(suggestion: str) -> str:
+    """Icon for an improvement suggestion, based on the area it addresses"""
+    for pattern, icon in _SUGGESTION_ICONS:
+        if pattern.search(suggestion):
+            return icon
+    return "💡"
+
+# Most title suggestions offered from a content brief
+MAX_TITLE_OPTIONS = 5
+
+# Leading bullet markers and list numbering ("- ", "• ", "* ", "1. ", "10) ") of a brief line
+_BULLET_RE = re.compile(r'^\s*(?:[-•*]\s+)*(?:\d+[.)]\s*)?')
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def extract_title_options(brief_text: str) -> list:
+    """Title suggestions from a content brief: the lines following each 'title' mention"""
+    title_options = []
+    lines = brief_text.split('\n')
+    for i, line in enumerate(lines):
+        if 'title' in line.casefold():
+            # Look for the next 3 lines after "title" mention
+            for next_line in lines[i + 1:i + 4]:
+                next_line = next_line.strip()
+                if next_line and not next_line.startswith('#'):
+                    title_options.append(_BULLET_RE.sub('', next_line, count=1))
+                    if len(title_options) == MAX_TITLE_OPTIONS:
+                        return title_options
+    return title_options
+
+# Page configuration
+st.set_page_config(
+    page_title="BMM SEO Agent",
+    page_icon="🔍",
+    layout="wide"
+)
+
+# Custom CSS
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Title
 st.title("🔍 BMM SEO Agent")
@@ -93,9 +243,21 @@ if 'keywords_data' not in st.session_state:
     st.session_state.keywords_data = None
 if 'serp_data' not in st.session_state:
     st.session_state.serp_data = None
+if 'keywords_df' not in st.session_state:
+    st.session_state.keywords_df = None
+if 'keywords_slug' not in st.session_state:
+    st.session_state.keywords_slug = ""
+if 'session_id' not in st.session_state:
+    # New browser session: sweep store files left behind by sessions that have gone idle
+    st.session_state.session_id = session_store.new_session_id()
+    session_store.cleanup_expired_sessions()
+else:
+    # Keep this live session's chat log from being swept as idle
+    session_store.touch_session(st.session_state.session_id)
 
-# Create tabs
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
+# Section navigation. Only the selected section's body runs on each rerun, so
+# hidden sections no longer build widgets, tables and charts nobody can see.
+TAB_LABELS = (
     "🔑 Keyword Research", 
     "📊 SERP Analysis", 
     "🏆 Competitor Analysis",
@@ -105,68 +267,93 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
     "📝 Content Brief",
     "✍️ Content Generator",
     "🌐 Domain Analytics"
-])
+)
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = TAB_LABELS
 
-with tab1:
-    # Input section
-    col1, col2 = st.columns([3, 1])
-    
-    with col1:
-        seed_keyword = st.text_input(
-            "Enter your seed keyword",
-            key="keyword_research_input",
-            placeholder="e.g., SEO tools, digital marketing, etc."
-        )
-    
-    with col2:
-        st.markdown("<br>", unsafe_allow_html=True)
-        generate_button = st.button("Generate Keywords", type="primary", use_container_width=True)
-    
-    # Filters
-    st.markdown("### 🎯 Filters")
-    filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
-    
-    with filter_col1:
-        country = st.selectbox(
-            "Country",
-            options=["us", "uk", "ca", "au", "in", "de", "fr", "es", "br", "jp"],
-            format_func=lambda x: {
-                "us": "🇺🇸 United States",
-                "uk": "🇬🇧 United Kingdom",
-                "ca": "🇨🇦 Canada",
-                "au": "🇦🇺 Australia",
-                "in": "🇮🇳 India",
-                "de": "🇩🇪 Germany",
-                "fr": "🇫🇷 France",
-                "es": "🇪🇸 Spain",
-                "br": "🇧🇷 Brazil",
-                "jp": "🇯🇵 Japan"
-            }.get(x, x)
-        )
-    
-    with filter_col2:
-        language = st.selectbox(
-            "Language",
-            options=["en", "es", "fr", "de", "pt", "it", "ja", "ko", "zh", "hi"],
-            format_func=lambda x: {
-                "en": "English",
-                "es": "Spanish",
-                "fr": "French",
-                "de": "German",
-                "pt": "Portuguese",
-                "it": "Italian",
-                "ja": "Japanese",
-                "ko": "Korean",
-                "zh": "Chinese",
-                "hi": "Hindi"
-            }.get(x, x)
-        )
-    
-    with filter_col3:
-        min_volume = st.number_input("Min Search Volume", min_value=0, value=100, step=100)
-    
-    with filter_col4:
-        max_difficulty = st.number_input("Max Difficulty", min_value=0, max_value=100, value=70, step=10)
+# Streamlit drops the state of keyed widgets that were not rendered during a run.
+# Re-assigning the keys of the hidden sections keeps their inputs from resetting;
+# the visible section's widgets are rendered as usual and keep their own state.
+_STICKY_WIDGET_KEYS = {
+    tab1: ("keyword_research_input", "research_country", "research_language",
+           "research_min_volume", "research_max_difficulty"),
+    tab3: ("competitor_domain_input",),
+    tab4: ("volume_keywords_input", "trends_keywords_input", "trends_time_range"),
+    tab5: ("content_url_input", "content_enable_js"),
+    tab6: ("report_compress",),
+    tab7: ("content_brief_keyword_input", "content_brief_audience_input", "content_brief_type"),
+    tab8: ("content_generator_type", "content_generator_audience_input", "content_generator_title_input",
+           "custom_title_input", "content_generator_word_count", "content_tone", "content_readability",
+           "h1_count", "h2_count", "h3_count", "h2_keywords", "h3_keywords",
+           "include_examples", "use_storytelling", "add_questions",
+           "use_contractions", "vary_sentences", "personal_pronouns",
+           "content_generator_use_mcp", "content_generator_chat_input",
+           "tips_expanded", "research_data_expanded"),
+    tab9: ("domain_analytics_input", "domain_country", "domain_limit", "domain_language")
+}
+for _section, _keys in _STICKY_WIDGET_KEYS.items():
+    if _section == st.session_state.get("active_tab", tab1):
+        continue
+    for _key in _keys:
+        if _key in st.session_state:
+            st.session_state[_key] = st.session_state[_key]
+
+active_tab = st.radio(
+    "Section",
+    TAB_LABELS,
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_tab"
+)
+
+# Research settings from the Keyword Research section, shared with the other sections
+seed_keyword = st.session_state.get("keyword_research_input", "")
+country = st.session_state.get("research_country", "us")
+language = st.session_state.get("research_language", "en")
+
+@fragment
+def render_keyword_research_section():
+    """Keyword Research section"""
+    # Inputs and filters only rerun the script when the form is submitted
+    with st.form("keyword_research_form", clear_on_submit=False):
+        # Input section
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            seed_keyword = st.text_input(
+                "Enter your seed keyword",
+                key="keyword_research_input",
+                placeholder="e.g., SEO tools, digital marketing, etc."
+            )
+        
+        with col2:
+            st.markdown("<br>", unsafe_allow_html=True)
+            generate_button = st.form_submit_button("Generate Keywords", type="primary", use_container_width=True)
+        
+        # Filters
+        st.markdown("### 🎯 Filters")
+        filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+        
+        with filter_col1:
+            country = st.selectbox(
+                "Country",
+                options=["us", "uk", "ca", "au", "in", "de", "fr", "es", "br", "jp"],
+                key="research_country",
+                format_func=COUNTRY_LABELS.get
+            )
+        
+        with filter_col2:
+            language = st.selectbox(
+                "Language",
+                options=["en", "es", "fr", "de", "pt", "it", "ja", "ko", "zh", "hi"],
+                key="research_language",
+                format_func=LANGUAGE_LABELS.get
+            )
+        
+        with filter_col3:
+            min_volume = st.number_input("Min Search Volume", min_value=0, value=100, step=100, key="research_min_volume")
+        
+        with filter_col4:
+            max_difficulty = st.number_input("Max Difficulty", min_value=0, max_value=100, value=70, step=10, key="research_max_difficulty")
     
     # Generate keywords
     if generate_button and seed_keyword:
@@ -184,8 +371,10 @@ with tab1:
                     max_difficulty=max_difficulty
                 )
                 
-                # Store in session state
+                # Store in session state (the DataFrame is built once here and reused by every tab)
                 st.session_state.keywords_data = keywords_data
+                st.session_state.keywords_df = pd.DataFrame(keywords_data)
+                st.session_state.keywords_slug = filename_slug(seed_keyword)
                 
                 # Success message
                 st.success(f"✅ Generated {len(keywords_data)} keyword suggestions!")
@@ -200,7 +389,7 @@ with tab1:
         # Statistics
         stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
         
-        df = pd.DataFrame(st.session_state.keywords_data)
+        df = st.session_state.keywords_df
         
         with stats_col1:
             st.metric("Total Keywords", len(df))
@@ -217,9 +406,10 @@ with tab1:
             avg_cpc = df['cpc'].mean() if not df.empty else 0
             st.metric("Avg. CPC", f"${avg_cpc:.2f}")
         
-        # Display table
-        st.dataframe(
+        # Display table (exports below always use the full DataFrame)
+        render_capped_dataframe(
             df,
+            export_hint=True,
             use_container_width=True,
             height=400,
             column_config={
@@ -235,29 +425,33 @@ with tab1:
         export_col1, export_col2 = st.columns(2)
         
         with export_col1:
-            csv_data = export_to_csv(df)
+            csv_data = keywords_csv_export(df)
             st.download_button(
                 label="📥 Export as CSV",
                 data=csv_data,
-                file_name=f"keywords_{seed_keyword.replace(' ', '_')}.csv",
+                file_name=f"keywords_{st.session_state.keywords_slug}.csv",
                 mime="text/csv"
             )
         
         with export_col2:
-            excel_data = export_to_excel(df)
+            excel_data = keywords_excel_export(df)
             st.download_button(
                 label="📥 Export as Excel",
                 data=excel_data,
-                file_name=f"keywords_{seed_keyword.replace(' ', '_')}.xlsx",
+                file_name=f"keywords_{st.session_state.keywords_slug}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
 
-with tab2:
+@fragment
+def render_serp_analysis_section():
+    """SERP Analysis section"""
     st.markdown("### 🔍 SERP Analysis")
     
     if st.session_state.keywords_data is not None:
         # Select keyword for SERP analysis
-        keywords_list = [kw['keyword'] for kw in st.session_state.keywords_data]
+        keywords_df = st.session_state.keywords_df
+        # A research run that matched no keywords leaves a DataFrame without columns
+        keywords_list = keywords_df['keyword'] if not keywords_df.empty else []
         selected_keyword = st.selectbox("Select a keyword to analyze", keywords_list)
         
         if st.button("Analyze SERP", type="primary"):
@@ -274,8 +468,11 @@ with tab2:
         if st.session_state.serp_data is not None:
             st.markdown("#### Top Ranking Pages")
             
-            for idx, result in enumerate(st.session_state.serp_data[:10], 1):
-                with st.expander(f"#{idx} - {result.get('title', 'No title')}", expanded=(idx <= 3)):
+            top_results = st.session_state.serp_data[:10]
+            
+            # Top 3 results in full
+            for idx, result in enumerate(top_results[:3], 1):
+                with st.expander(f"#{idx} - {result.get('title', 'No title')}", expanded=True):
                     st.markdown(f"**URL:** {result.get('url', '')}")
                     st.markdown(f"**Description:** {result.get('description', '')}")
                     
@@ -283,10 +480,30 @@ with tab2:
                     if 'insights' in result:
                         st.markdown("**AI Insights:**")
                         st.info(result['insights'])
+            
+            # The rest as one table instead of a collapsed expander per result
+            if len(top_results) > 3:
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "#": idx,
+                            "Title": result.get('title', 'No title'),
+                            "URL": result.get('url', ''),
+                            "Description": result.get('description', ''),
+                            "AI Insights": result.get('insights', '')
+                        }
+                        for idx, result in enumerate(top_results[3:], 4)
+                    ]),
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={"URL": st.column_config.LinkColumn("URL")}
+                )
     else:
         st.info("👆 Please generate keywords first in the Keyword Research tab")
 
-with tab3:
+@fragment
+def render_competitor_analysis_section():
+    """Competitor Analysis section"""
     st.markdown("### 🏆 Competitor Analysis")
     
     competitor_col1, competitor_col2 = st.columns(2)
@@ -315,7 +532,7 @@ with tab3:
                             
                             # Display competitors table
                             competitor_df = pd.DataFrame(competitors)
-                            st.dataframe(
+                            render_capped_dataframe(
                                 competitor_df,
                                 use_container_width=True,
                                 column_config={
@@ -350,7 +567,7 @@ with tab3:
                             
                             # Display competitor keywords
                             comp_kw_df = pd.DataFrame(competitor_keywords)
-                            st.dataframe(
+                            render_capped_dataframe(
                                 comp_kw_df,
                                 use_container_width=True,
                                 height=400
@@ -361,7 +578,9 @@ with tab3:
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
 
-with tab4:
+@fragment
+def render_trends_volume_section():
+    """Trends & Volume section"""
     st.markdown("### 📈 Trends & Volume Analysis")
     
     trends_col1, trends_col2 = st.columns(2)
@@ -388,7 +607,7 @@ with tab4:
                             
                             # Display volume data
                             volume_df = pd.DataFrame(volume_data)
-                            st.dataframe(
+                            render_capped_dataframe(
                                 volume_df,
                                 use_container_width=True,
                                 column_config={
@@ -414,7 +633,8 @@ with tab4:
         time_range = st.selectbox(
             "Time Range",
             ["past_hour", "past_day", "past_7_days", "past_30_days", "past_90_days", "past_12_months", "past_5_years"],
-            index=5
+            index=5,
+            key="trends_time_range"
         )
         
         if st.button("Get Trends Data"):
@@ -437,15 +657,16 @@ with tab4:
                             # Show related queries
                             if trends_data.get('related_queries'):
                                 st.markdown("#### Related Queries")
-                                for query in trends_data['related_queries'][:5]:
-                                    st.write(f"• {query}")
+                                st.markdown(bullets(trends_data['related_queries'], 5))
                         else:
                             st.warning("No trends data found")
                             
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
 
-with tab5:
+@fragment
+def render_content_analysis_section():
+    """Content Analysis section"""
     st.markdown("### 🔍 Content Analysis")
     
     content_url = st.text_input(
@@ -454,7 +675,7 @@ with tab5:
         placeholder="https://example.com/page"
     )
     
-    enable_js = st.checkbox("Enable JavaScript", value=True)
+    enable_js = st.checkbox("Enable JavaScript", value=True, key="content_enable_js")
     
     if st.button("Analyze Content", type="primary"):
         if content_url:
@@ -482,43 +703,23 @@ with tab5:
                         else:
                             st.warning("⚠️ Content extraction method unknown")
                         
-                        # Display content metrics
-                        metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
-                        
-                        with metrics_col1:
-                            st.metric("OnPage Score", f"{content_data.get('onpage_score', 0):.1f}/100")
-                        
-                        with metrics_col2:
-                            word_count = content_data.get('word_count', 0)
-                            st.metric("Word Count", word_count)
-                        
-                        with metrics_col3:
-                            load_time = content_data.get('load_time', 0)
-                            st.metric("Load Time", f"{load_time}ms" if isinstance(load_time, (int, float)) else "N/A")
-                        
-                        with metrics_col4:
-                            page_size = content_data.get('page_size', 0)
-                            st.metric("Page Size", f"{page_size} bytes")
-                        
-                        # Additional metrics row
-                        metrics2_col1, metrics2_col2, metrics2_col3, metrics2_col4 = st.columns(4)
-                        
-                        with metrics2_col1:
-                            internal_links = content_data.get('internal_links', 0)
-                            st.metric("Internal Links", internal_links)
-                        
-                        with metrics2_col2:
-                            external_links = content_data.get('external_links', 0)
-                            st.metric("External Links", external_links)
-                        
-                        with metrics2_col3:
-                            images = content_data.get('images', 0)
-                            st.metric("Images", images)
+                        # Display content metrics - one 4-column grid, filled row by row
+                        load_time = content_data.get('load_time', 0)
+                        flesch_score = content_data.get('readability', {}).get('flesch_kincaid', 0)
+                        content_metrics = {
+                            "OnPage Score": f"{content_data.get('onpage_score', 0):.1f}/100",
+                            "Word Count": content_data.get('word_count', 0),
+                            "Load Time": f"{load_time}ms" if isinstance(load_time, (int, float)) else "N/A",
+                            "Page Size": f"{content_data.get('page_size', 0)} bytes",
+                            "Internal Links": content_data.get('internal_links', 0),
+                            "External Links": content_data.get('external_links', 0),
+                            "Images": content_data.get('images', 0),
+                            "Reading Score": f"{flesch_score:.1f}"
+                        }
                         
-                        with metrics2_col4:
-                            readability = content_data.get('readability', {})
-                            flesch_score = readability.get('flesch_kincaid', 0)
-                            st.metric("Reading Score", f"{flesch_score:.1f}")
+                        metric_cols = st.columns(4)
+                        for i, (label, value) in enumerate(content_metrics.items()):
+                            metric_cols[i % 4].metric(label, value)
                         
                         # Content details
                         st.markdown("#### Content Structure")
@@ -543,49 +744,29 @@ with tab5:
                             st.markdown("**Meta Description:**")
                             st.write(meta_desc if meta_desc else 'N/A')
                             
-                            st.markdown("**H1 Tags:**")
-                            for h1 in content_data.get('h1_tags', [])[:3]:
-                                st.write(f"• {h1}")
+                            st.markdown("**H1 Tags:**  \n" + bullets(content_data.get('h1_tags', []), 3))
                         
                         with detail_col2:
-                            st.markdown("**H2 Tags:**")
-                            for h2 in content_data.get('h2_tags', [])[:5]:
-                                st.write(f"• {h2}")
+                            st.markdown("**H2 Tags:**  \n" + bullets(content_data.get('h2_tags', []), 5))
                             
-                            st.markdown("**H3 Tags:**")
-                            for h3 in content_data.get('h3_tags', [])[:5]:
-                                st.write(f"• {h3}")
+                            st.markdown("**H3 Tags:**  \n" + bullets(content_data.get('h3_tags', []), 5))
                         
                         # SEO Checks
                         st.markdown("#### ✅ SEO Checks")
                         seo_checks = content_data.get('seo_checks', {})
                         api_checks = content_data.get('checks', {})
                         
-                        check_col1, check_col2, check_col3, check_col4, check_col5 = st.columns(5)
-                        
-                        with check_col1:
-                            status = "✅" if seo_checks.get('has_https') else "❌"
-                            st.write(f"{status} HTTPS")
-                        
-                        with check_col2:
-                            status = "✅" if seo_checks.get('has_title') else "❌"
-                            st.write(f"{status} Title")
-                        
-                        with check_col3:
-                            status = "✅" if seo_checks.get('has_description') else "❌"
-                            st.write(f"{status} Meta Desc")
-                        
-                        with check_col4:
-                            # Check for favicon in seo_checks first, then api_checks
-                            has_favicon = seo_checks.get('has_favicon', False) or not api_checks.get('no_favicon', True)
-                            status = "✅" if has_favicon else "❌"
-                            st.write(f"{status} Favicon")
-                        
-                        with check_col5:
-                            # Check for SEO friendly URL in seo_checks first, then api_checks
-                            seo_friendly = seo_checks.get('seo_friendly_url', False) or api_checks.get('seo_friendly_url', False)
-                            status = "✅" if seo_friendly else "❌"
-                            st.write(f"{status} SEO URL")
+                        # Check for favicon and SEO friendly URL in seo_checks first, then api_checks
+                        seo_check_results = {
+                            "HTTPS": seo_checks.get('has_https'),
+                            "Title": seo_checks.get('has_title'),
+                            "Meta Desc": seo_checks.get('has_description'),
+                            "Favicon": seo_checks.get('has_favicon', False) or not api_checks.get('no_favicon', True),
+                            "SEO URL": seo_checks.get('seo_friendly_url', False) or api_checks.get('seo_friendly_url', False)
+                        }
+                        st.markdown(" &nbsp;&nbsp; ".join(
+                            f"{'✅' if passed else '❌'} {label}" for label, passed in seo_check_results.items()
+                        ))
                         
                         # AI Insights
                         st.markdown("#### 🤖 AI Optimization Insights")
@@ -601,7 +782,6 @@ with tab5:
                         else:
                             # Generate insights if not available
                             with st.spinner("Generating AI insights..."):
-                                from agents.keyword_agent import KeywordAgent
                                 agent = KeywordAgent()
                                 insights = agent._generate_content_insights(content_data)
                                 if insights:
@@ -615,7 +795,9 @@ with tab5:
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
 
-with tab6:
+@fragment
+def render_reports_section():
+    """Reports section"""
     st.markdown("### 📋 Reports & Analytics")
     
     st.markdown("#### 📊 Session Summary")
@@ -625,7 +807,7 @@ with tab6:
     with summary_col1:
         if st.session_state.keywords_data:
             total_keywords = len(st.session_state.keywords_data)
-            avg_volume = sum(kw.get('search_volume', 0) for kw in st.session_state.keywords_data) // max(total_keywords, 1)
+            avg_volume = int(st.session_state.keywords_df['search_volume'].fillna(0).mean())
             st.metric("Keywords Researched", total_keywords)
             st.metric("Avg. Search Volume", f"{avg_volume:,}")
     
@@ -643,6 +825,12 @@ with tab6:
         export_col1, export_col2 = st.columns(2)
         
         with export_col1:
+            compress_report = st.checkbox(
+                "Compress report (.json.gz)",
+                key="report_compress",
+                help="Compact, gzip-compressed JSON - much smaller for large keyword and SERP sets"
+            )
+            
             if st.button("📊 Generate Summary Report"):
                 # Create comprehensive report
                 report_data = {
@@ -655,18 +843,25 @@ with tab6:
                     }
                 }
                 
-                st.download_button(
-                    label="📥 Download JSON Report",
-                    data=json.dumps(report_data, indent=2),
-                    file_name=f"seo_analysis_report_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
-                )
+                report_name = f"seo_analysis_report_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}"
+                if compress_report:
+                    st.download_button(
+                        label="📥 Download JSON Report (.gz)",
+                        data=export_to_json_gzip(report_data),
+                        file_name=f"{report_name}.json.gz",
+                        mime="application/gzip"
+                    )
+                else:
+                    st.download_button(
+                        label="📥 Download JSON Report",
+                        data=export_to_json(report_data),
+                        file_name=f"{report_name}.json",
+                        mime="application/json"
+                    )
         
         with export_col2:
             if st.button("📈 Generate Excel Report"):
                 # Create multi-sheet Excel report
-                from utils.export import create_keyword_report
-                
                 if st.session_state.keywords_data:
                     report = create_keyword_report(
                         st.session_state.keywords_data,
@@ -677,7 +872,9 @@ with tab6:
 
 # Enhanced trend analysis has been moved to tab4
 
-with tab7:
+@fragment
+def render_content_brief_section():
+    """Content Brief section"""
     st.markdown("### 📝 Content Brief Generator")
     st.markdown("Generate comprehensive content briefs based on keyword and SERP analysis")
     
@@ -691,9 +888,9 @@ with tab7:
         # Get available keywords from session state
         available_keywords = []
         if st.session_state.keywords_data:
-            available_keywords = [kw['keyword'] for kw in st.session_state.keywords_data]
+            available_keywords = st.session_state.keywords_df['keyword']
         
-        if available_keywords:
+        if len(available_keywords):
             selected_keyword = st.selectbox(
                 "Choose a keyword to create content brief for:",
                 options=available_keywords,
@@ -718,8 +915,9 @@ with tab7:
         # Additional context
         content_type = st.selectbox(
             "Content Type",
-            options=["Blog Post", "Landing Page", "Product Page", "Guide/Tutorial", "Comparison Article"],
-            index=0
+            options=CONTENT_TYPES,
+            index=0,
+            key="content_brief_type"
         )
         
         # Generate button
@@ -753,6 +951,8 @@ with tab7:
                             'brief': brief,
                             'timestamp': pd.Timestamp.now().isoformat()
                         }
+                        # Serialized once here; the JSON download reuses it on every rerun
+                        st.session_state.content_brief_json = export_to_json(st.session_state.content_brief)
                         
                         st.success("✅ Content brief generated successfully!")
                         
@@ -791,16 +991,17 @@ with tab7:
         with st.expander("📝 Full Content Brief", expanded=True):
             st.markdown(st.session_state.content_brief['brief'])
         
-        # Export options
+        # Export options (one file name stem for both downloads)
         st.markdown("#### 📥 Export Options")
         export_col1, export_col2 = st.columns(2)
+        brief_file_stem = f"content_brief_{filename_slug(st.session_state.content_brief['keyword'])}_{pd.Timestamp.now().strftime('%Y%m%d')}"
         
         with export_col1:
             # Export as text
             st.download_button(
                 label="📄 Download as Text",
                 data=f"Content Brief for: {st.session_state.content_brief['keyword']}\n\n{st.session_state.content_brief['brief']}",
-                file_name=f"content_brief_{st.session_state.content_brief['keyword'].replace(' ', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.txt",
+                file_name=f"{brief_file_stem}.txt",
                 mime="text/plain"
             )
         
@@ -808,18 +1009,59 @@ with tab7:
             # Export as JSON
             st.download_button(
                 label="📊 Download as JSON",
-                data=json.dumps(st.session_state.content_brief, indent=2),
-                file_name=f"content_brief_{st.session_state.content_brief['keyword'].replace(' ', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.json",
+                data=st.session_state.get('content_brief_json') or export_to_json(st.session_state.content_brief),
+                file_name=f"{brief_file_stem}.json",
                 mime="application/json"
             )
 
-with tab8:
+# Shown under the Content Generator before any content exists
+_TIPS_MARKDOWN = """
+**For Best Results:**
+1. Generate a content brief first (Tab 7) for comprehensive guidance
+2. Use real-time SEO data for competitive insights
+3. Be specific with your target audience
+4. Use the chat to refine and improve the content
+5. Review improvement suggestions after generation
+
+**Content Types:**
+- **Blog Post:** Informative articles with SEO focus
+- **Landing Page:** Conversion-focused content
+- **Product Page:** Feature and benefit-driven content
+- **Guide/Tutorial:** Step-by-step instructional content
+- **Comparison Article:** Side-by-side analysis content
+"""
+
+def clear_chat():
+    """Clear Chat callback: empties the chat window and the session's chat log on disk"""
+    st.session_state.chat_history.clear()
+    session_store.clear_chat_history(st.session_state.session_id)
+
+@fragment
+def render_chat_history():
+    """Last chat messages and the Clear Chat button; clearing reruns only this fragment"""
+    chat_container = st.container()
+    with chat_container:
+        for msg in recent_chat(5):  # Show last 5 messages
+            with st.chat_message("user" if msg['role'] == 'user' else "assistant"):
+                st.markdown(msg['content'])
+    
+    # Older messages only exist in the on-disk log, read only while the toggle is on
+    if st.session_state.chat_history and st.toggle("Show full chat log", key="show_full_chat"):
+        for msg in session_store.load_chat_history(st.session_state.session_id):
+            st.markdown(f"**{'You' if msg['role'] == 'user' else 'Assistant'}:** {msg['content']}")
+    
+    # Clear chat button (the callback runs before the fragment reruns, so no st.rerun is needed)
+    st.button("🗑️ Clear Chat", on_click=clear_chat)
+
+@fragment
+def render_content_generator_section():
+    """Content Generator section"""
     st.markdown("### ✍️ AI Content Generator")
     st.markdown("Generate SEO-optimized content based on your content brief")
     
-    # Initialize session state for chat history
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    # Initialize session state for chat history (only the latest turns; older messages are on disk)
+    if not isinstance(st.session_state.get('chat_history'), deque):
+        st.session_state.chat_history = deque(st.session_state.get('chat_history') or [], maxlen=LLM_CONTEXT_TURNS)
     if 'generated_content' not in st.session_state:
         st.session_state.generated_content = None
     
@@ -840,7 +1082,8 @@ with tab8:
         # Content Type Selection
         content_type = st.selectbox(
             "Content Type",
-            options=["Blog Post", "Landing Page", "Product Page", "Guide/Tutorial", "Comparison Article"],
+            options=CONTENT_TYPES,
+            key="content_generator_type",
             help="Select the type of content to generate"
         )
         
@@ -859,15 +1102,7 @@ with tab8:
         
         if has_brief and st.session_state.content_brief.get('brief'):
             # Extract title suggestions from brief
-            brief_text = st.session_state.content_brief['brief']
-            lines = brief_text.split('\n')
-            for i, line in enumerate(lines):
-                if 'title' in line.lower() and i + 1 < len(lines):
-                    # Look for the next 3 lines after "title" mention
-                    for j in range(1, min(4, len(lines) - i)):
-                        next_line = lines[i + j].strip()
-                        if next_line and not next_line.startswith('#'):
-                            title_options.append(next_line.lstrip('- •123. '))
+            title_options = extract_title_options(st.session_state.content_brief['brief'])
         
         if title_options:
             title_options.append("Custom Title")
@@ -891,6 +1126,7 @@ with tab8:
             max_value=4000,
             value=1500,
             step=100,
+            key="content_generator_word_count",
             help="Approximate word count for the content"
         )
         
@@ -1040,47 +1276,39 @@ with tab8:
         use_mcp = st.checkbox(
             "🔍 Use Real-time SEO Data",
             value=True,
+            key="content_generator_use_mcp",
             help="Enhance content with current SERP and keyword data"
         )
         
         # Chat Interface
         st.markdown("#### 💬 Refinement Chat")
         
-        # Display chat history
-        chat_container = st.container()
-        with chat_container:
-            for msg in st.session_state.chat_history[-5:]:  # Show last 5 messages
-                if msg['role'] == 'user':
-                    st.info(f"You: {msg['content']}")
-                else:
-                    st.success(f"AI: {msg['content']}")
-        
-        # Chat input
-        user_input = st.text_area(
-            "Additional instructions or refinements:",
-            key="content_generator_chat_input",
-            placeholder="e.g., 'Add more statistics', 'Make it more conversational', 'Include case studies'",
-            height=100
-        )
+        # Chat history slot, filled after the button handlers so their new messages show on this run
+        chat_slot = st.container()
         
-        # Action buttons
-        button_col1, button_col2 = st.columns(2)
+        # Chat input and action buttons; the form only sends the instructions on submit
+        with st.form("refine_form", clear_on_submit=False):
+            user_input = st.text_area(
+                "Additional instructions or refinements:",
+                key="content_generator_chat_input",
+                placeholder="e.g., 'Add more statistics', 'Make it more conversational', 'Include case studies'",
+                height=100
+            )
+            
+            button_col1, button_col2 = st.columns(2)
+            generate_clicked = button_col1.form_submit_button("🚀 Generate Content", type="primary", disabled=not title)
+            refine_clicked = button_col2.form_submit_button("🔄 Refine Content")
         
         with button_col1:
-            if st.button("🚀 Generate Content", type="primary", disabled=not title):
+            if generate_clicked:
                 if title:
                     with st.spinner("✨ Generating content with AI..."):
                         try:
-                            # Import the content generator
-                            from agents.content_generator import ContentGeneratorAgent
-                            generator = ContentGeneratorAgent()
+                            generator = get_content_generator()
                             
                             # Add user input to chat history if provided
                             if user_input:
-                                st.session_state.chat_history.append({
-                                    'role': 'user',
-                                    'content': user_input
-                                })
+                                add_chat_message('user', user_input)
                             
                             # Get content brief
                             content_brief = st.session_state.content_brief if has_brief else {
@@ -1095,7 +1323,7 @@ with tab8:
                                 target_audience=target_audience,
                                 title=title,
                                 word_count=word_count,
-                                chat_history=st.session_state.chat_history,
+                                chat_history=recent_chat(LLM_CONTEXT_TURNS),
                                 use_mcp_research=use_mcp,
                                 heading_structure=heading_structure,
                                 tone=tone,
@@ -1104,15 +1332,11 @@ with tab8:
                             
                             st.session_state.generated_content = result
                             # ALSO store as a separate key that might persist better
-                            st.session_state['content_backup'] = result['content']
-                            st.session_state['metadata_backup'] = result.get('metadata', {})
+                            set_generated_content(result['content'])
                             print(f"DEBUG: Content stored, length: {len(result.get('content', ''))}")
                             
                             # Add AI response to chat
-                            st.session_state.chat_history.append({
-                                'role': 'assistant',
-                                'content': f"Generated {result['metadata'].get('word_count', 0)} words of {content_type} content."
-                            })
+                            add_chat_message('assistant', f"Generated {result['metadata'].get('word_count', 0)} words of {content_type} content.")
                             
                             st.success("✅ Content generated successfully!")
                             # st.rerun()  # Removed: Causing refresh loop
@@ -1123,17 +1347,13 @@ with tab8:
                     st.warning("Please enter a title")
         
         with button_col2:
-            if st.button("🔄 Refine Content") and st.session_state.generated_content and user_input:
+            if refine_clicked and st.session_state.generated_content and user_input:
                 with st.spinner("🔧 Refining content..."):
                     try:
-                        from agents.content_generator import ContentGeneratorAgent
-                        generator = ContentGeneratorAgent()
+                        generator = get_content_generator()
                         
                         # Add refinement request to chat
-                        st.session_state.chat_history.append({
-                            'role': 'user',
-                            'content': user_input
-                        })
+                        add_chat_message('user', user_input)
                         
                         # Refine the content with updated word count
                         refined_content = generator.refine_content(
@@ -1144,20 +1364,15 @@ with tab8:
                         )
                         
                         # Update the content and metadata
-                        st.session_state.generated_content['content'] = refined_content
                         st.session_state.generated_content['metadata']['refined'] = True
                         st.session_state.generated_content['metadata']['word_count'] = len(refined_content.split())
                         
                         # Also update backup storage for DigitalOcean
-                        st.session_state['content_backup'] = refined_content
-                        st.session_state['metadata_backup'] = st.session_state.generated_content['metadata']
+                        set_generated_content(refined_content)
                         
                         # Add AI response with updated word count
                         new_word_count = len(refined_content.split())
-                        st.session_state.chat_history.append({
-                            'role': 'assistant',
-                            'content': f"Content refined. New word count: {new_word_count} words."
-                        })
+                        add_chat_message('assistant', f"Content refined. New word count: {new_word_count} words.")
                         
                         st.success("✅ Content refined!")
                         # st.rerun()  # Removed: Causing refresh loop
@@ -1165,10 +1380,9 @@ with tab8:
                     except Exception as e:
                         st.error(f"Refinement error: {str(e)}")
         
-        # Clear chat button
-        if st.button("🗑️ Clear Chat"):
-            st.session_state.chat_history = []
-            st.rerun()
+        # Display chat history
+        with chat_slot:
+            render_chat_history()
     
     with content_col:
         st.markdown("#### 📄 Generated Content")
@@ -1186,17 +1400,14 @@ with tab8:
             }
         
         if content_to_display:
-            # Display metadata
+            # Display metadata (one summary row)
             meta = content_to_display.get('metadata', {})
-            meta_col1, meta_col2, meta_col3 = st.columns(3)
-            
-            with meta_col1:
-                st.metric("Word Count", meta.get('word_count', 0))
-            with meta_col2:
-                st.metric("Content Type", meta.get('type', 'Unknown'))
-            with meta_col3:
-                research_status = "✅ Yes" if meta.get('research_used') else "❌ No"
-                st.metric("SEO Research", research_status)
+            meta_df = pd.DataFrame([{
+                "Word Count": meta.get('word_count', 0),
+                "Content Type": meta.get('type', 'Unknown'),
+                "SEO Research": "✅ Yes" if meta.get('research_used') else "❌ No"
+            }])
+            st.dataframe(meta_df, use_container_width=True, hide_index=True)
             
             # Display content in expandable section
             with st.expander("📝 Full Content", expanded=True):
@@ -1205,11 +1416,10 @@ with tab8:
             # Show research data if available
             research_data = st.session_state.generated_content.get('research_data', {})
             if research_data:
-                with st.expander("🔍 Research Data Used"):
+                if st.checkbox("🔍 Research Data Used", key="research_data_expanded"):
                     if research_data.get('competitor_insights'):
                         st.markdown("**Competitor Insights:**")
-                        for comp in research_data['competitor_insights']:
-                            st.write(f"• {comp['title']}")
+                        st.markdown(bullets([comp['title'] for comp in research_data['competitor_insights']]))
                     
                     if research_data.get('related_terms'):
                         st.markdown("**Related Keywords:**")
@@ -1222,8 +1432,7 @@ with tab8:
             if st.button("💡 Get Improvement Suggestions"):
                 with st.spinner("Analyzing content..."):
                     try:
-                        from agents.content_generator import ContentGeneratorAgent
-                        generator = ContentGeneratorAgent()
+                        generator = get_content_generator()
                         
                         suggestions = generator.suggest_improvements(
                             st.session_state.generated_content['content']
@@ -1234,60 +1443,49 @@ with tab8:
                         # Display suggestions in an expandable section
                         with st.expander("View AI-Powered Content Optimization Suggestions", expanded=True):
                             if suggestions:
-                                for i, suggestion in enumerate(suggestions, 1):
-                                    # Add icon based on suggestion area
-                                    if 'SEO' in suggestion:
-                                        icon = "🔍"
-                                    elif 'Readability' in suggestion:
-                                        icon = "📖"
-                                    elif 'Structure' in suggestion:
-                                        icon = "🏗️"
-                                    elif 'Call-to-action' in suggestion or 'CTA' in suggestion:
-                                        icon = "🎯"
-                                    elif 'audience' in suggestion.lower():
-                                        icon = "👥"
-                                    else:
-                                        icon = "💡"
-                                    
-                                    st.markdown(f"{icon} **{suggestion}**")
-                                    st.markdown("---")
+                                # One markdown element: each suggestion with its area icon, followed by a rule
+                                st.markdown("".join(
+                                    f"{suggestion_icon(suggestion)} **{suggestion}**\n\n---\n\n"
+                                    for suggestion in suggestions
+                                ))
                             else:
                                 st.info("No specific suggestions available at this time.")
                     
                     except Exception as e:
                         st.error(f"Error getting suggestions: {str(e)}")
             
-            # Export options
+            # Export options (one file name stem for all three downloads)
             st.markdown("#### 📥 Export Options")
             export_col1, export_col2, export_col3 = st.columns(3)
+            content_file_stem = f"content_{filename_slug(title.lower())}_{pd.Timestamp.now().strftime('%Y%m%d')}"
+            markdown_bytes, text_bytes, html_bytes = content_download_bytes(
+                generated_content_hash(), st.session_state.generated_content['content']
+            )
             
             with export_col1:
                 # Export as Markdown
                 st.download_button(
                     label="📝 Download Markdown",
-                    data=st.session_state.generated_content['content'],
-                    file_name=f"content_{title.lower().replace(' ', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.md",
+                    data=markdown_bytes,
+                    file_name=f"{content_file_stem}.md",
                     mime="text/markdown"
                 )
             
             with export_col2:
                 # Export as Text
-                text_content = st.session_state.generated_content['content'].replace('#', '').replace('*', '')
                 st.download_button(
                     label="📄 Download Text",
-                    data=text_content,
-                    file_name=f"content_{title.lower().replace(' ', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.txt",
+                    data=text_bytes,
+                    file_name=f"{content_file_stem}.txt",
                     mime="text/plain"
                 )
             
             with export_col3:
                 # Export as HTML
-                import markdown
-                html_content = markdown.markdown(st.session_state.generated_content['content'])
                 st.download_button(
                     label="🌐 Download HTML",
-                    data=html_content,
-                    file_name=f"content_{title.lower().replace(' ', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.html",
+                    data=html_bytes,
+                    file_name=f"{content_file_stem}.html",
                     mime="text/html"
                 )
             
@@ -1310,8 +1508,7 @@ with tab8:
                 
                 with st.spinner("🔄 Humanizing content..."):
                     try:
-                        from agents.content_generator import ContentGeneratorAgent
-                        generator = ContentGeneratorAgent()
+                        generator = get_content_generator()
                         
                         # Get current content and word count
                         current_content = st.session_state.generated_content['content']
@@ -1330,13 +1527,9 @@ with tab8:
                             target_word_count=current_words
                         )
                         
-                        # Update content and metadata
-                        st.session_state.generated_content['content'] = humanized_result['content']
+                        # Update content and metadata (and the backup storage)
                         st.session_state.generated_content['metadata'].update(humanized_result['metadata'])
-                        
-                        # Also update backup storage
-                        st.session_state['content_backup'] = humanized_result['content']
-                        st.session_state['metadata_backup'] = st.session_state.generated_content['metadata']
+                        set_generated_content(humanized_result['content'])
                         
                         # Clear progress and show success
                         progress_placeholder.empty()
@@ -1351,10 +1544,7 @@ with tab8:
                         {"- Content expanded to maintain length" if meta['expanded'] else ""}""")
                         
                         # Add to chat history
-                        st.session_state.chat_history.append({
-                            'role': 'assistant',
-                            'content': f"Content humanized successfully. Final word count: {meta['final_words']} words ({meta['accuracy_percentage']}% of target)."
-                        })
+                        add_chat_message('assistant', f"Content humanized successfully. Final word count: {meta['final_words']} words ({meta['accuracy_percentage']}% of target).")
                         
                         # Force a rerun to update the display
                         # st.rerun()  # Removed: Causing infinite loop on Digital Ocean
@@ -1365,40 +1555,26 @@ with tab8:
             # Option to restore original (only show if content has been humanized)
             if is_humanized and 'original_before_humanize' in st.session_state:
                 if st.button("↩️ Restore Original", help="Revert to the original non-humanized content"):
-                    st.session_state.generated_content['content'] = st.session_state.original_before_humanize
                     st.session_state.generated_content['metadata']['humanized'] = False
-                    st.session_state['content_backup'] = st.session_state.original_before_humanize
                     
                     # Recalculate word count
                     original_words = len(st.session_state.original_before_humanize.split())
                     st.session_state.generated_content['metadata']['word_count'] = original_words
-                    st.session_state['metadata_backup'] = st.session_state.generated_content['metadata']
+                    set_generated_content(st.session_state.original_before_humanize)
                     
                     st.success("✅ Original content restored")
                     # st.rerun()  # Removed: Causing refresh loop
         else:
             st.info("👆 Configure your content settings and click 'Generate Content' to begin")
             
-            # Show tips
-            with st.expander("💡 Tips for Better Content"):
-                st.markdown("""
-                **For Best Results:**
-                1. Generate a content brief first (Tab 7) for comprehensive guidance
-                2. Use real-time SEO data for competitive insights
-                3. Be specific with your target audience
-                4. Use the chat to refine and improve the content
-                5. Review improvement suggestions after generation
-                
-                **Content Types:**
-                - **Blog Post:** Informative articles with SEO focus
-                - **Landing Page:** Conversion-focused content
-                - **Product Page:** Feature and benefit-driven content
-                - **Guide/Tutorial:** Step-by-step instructional content
-                - **Comparison Article:** Side-by-side analysis content
-                """)
+            # Show tips (only built while the checkbox is ticked)
+            if st.checkbox("💡 Tips for Better Content", key="tips_expanded"):
+                st.markdown(_TIPS_MARKDOWN)
 
 # Tab 9: Domain Analytics & Traffic Tracking
-with tab9:
+@fragment
+def render_domain_analytics_section():
+    """Domain Analytics section"""
     st.header("🌐 Domain Analytics & Traffic Tracking")
     st.markdown("Track your website's keyword rankings, positions, and estimated traffic")
     
@@ -1417,10 +1593,7 @@ with tab9:
         country_domain = st.selectbox(
             "Country",
             options=["us", "uk", "au", "ca", "in", "de", "fr", "es", "it", "jp"],
-            format_func=lambda x: {"us": "🇺🇸 United States", "uk": "🇬🇧 United Kingdom", 
-                                  "au": "🇦🇺 Australia", "ca": "🇨🇦 Canada", "in": "🇮🇳 India",
-                                  "de": "🇩🇪 Germany", "fr": "🇫🇷 France", "es": "🇪🇸 Spain",
-                                  "it": "🇮🇹 Italy", "jp": "🇯🇵 Japan"}.get(x, x),
+            format_func=COUNTRY_LABELS.get,
             key="domain_country"
         )
     
@@ -1443,9 +1616,7 @@ with tab9:
             language_domain = st.selectbox(
                 "Language",
                 options=["en", "es", "fr", "de", "it", "pt", "ru", "ja", "zh"],
-                format_func=lambda x: {"en": "English", "es": "Spanish", "fr": "French",
-                                      "de": "German", "it": "Italian", "pt": "Portuguese",
-                                      "ru": "Russian", "ja": "Japanese", "zh": "Chinese"}.get(x, x),
+                format_func=LANGUAGE_LABELS.get,
                 key="domain_language"
             )
     
@@ -1454,7 +1625,6 @@ with tab9:
         with st.spinner(f"🔍 Analyzing domain: {domain_input}..."):
             try:
                 # Initialize agent
-                from agents.keyword_agent import KeywordAgent
                 agent = KeywordAgent()
                 
                 # Get domain analytics
@@ -1677,6 +1847,8 @@ with tab9:
                         # Export options
                         st.markdown("### 📥 Export Results")
                         export_col1, export_col2 = st.columns(2)
+                        domain_slug = domain_input.replace('.', '_')
+                        today = pd.Timestamp.now().strftime('%Y%m%d')
                         
                         with export_col1:
                             # CSV export
@@ -1684,7 +1856,7 @@ with tab9:
                             st.download_button(
                                 label="📊 Download CSV",
                                 data=csv,
-                                file_name=f"domain_analytics_{domain_input.replace('.', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
+                                file_name=f"domain_analytics_{domain_slug}_{today}.csv",
                                 mime="text/csv"
                             )
                         
@@ -1694,7 +1866,7 @@ with tab9:
                             st.download_button(
                                 label="📋 Download Full Report (JSON)",
                                 data=json_data,
-                                file_name=f"domain_report_{domain_input.replace('.', '_')}_{pd.Timestamp.now().strftime('%Y%m%d')}.json",
+                                file_name=f"domain_report_{domain_slug}_{today}.json",
                                 mime="application/json"
                             )
                     else:
@@ -1754,32 +1926,43 @@ with tab9:
         - **Regular Monitoring**: Track your progress by analyzing weekly or monthly
         """)
 
+# Render the selected section; widget interactions inside it rerun only that section
+SECTION_RENDERERS = {
+    tab1: render_keyword_research_section,
+    tab2: render_serp_analysis_section,
+    tab3: render_competitor_analysis_section,
+    tab4: render_trends_volume_section,
+    tab5: render_content_analysis_section,
+    tab6: render_reports_section,
+    tab7: render_content_brief_section,
+    tab8: render_content_generator_section,
+    tab9: render_domain_analytics_section
+}
+SECTION_RENDERERS[active_tab]()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def api_status_markdown() -> str:
+    """Sidebar API status lines (one markdown element), re-checked at most every 30 seconds"""
+    dataforseo = bool(os.getenv("DATAFORSEO_USERNAME") and os.getenv("DATAFORSEO_PASSWORD"))
+    openrouter = bool(os.getenv("OPENROUTER_API_KEY"))
+    return "\n\n".join((
+        "✅ DataForSEO Connected" if dataforseo else "❌ DataForSEO Not Connected",
+        "✅ OpenRouter Connected" if openrouter else "❌ OpenRouter Not Connected"
+    ))
+
 # Sidebar
 with st.sidebar:
     st.markdown("### 🛠️ Settings")
     
     # API Status
     st.markdown("#### API Status")
-    if os.getenv("DATAFORSEO_USERNAME") and os.getenv("DATAFORSEO_PASSWORD"):
-        st.success("✅ DataForSEO Connected")
-    else:
-        st.error("❌ DataForSEO Not Connected")
-    
-    if os.getenv("OPENROUTER_API_KEY"):
-        st.success("✅ OpenRouter Connected")
-    else:
-        st.error("❌ OpenRouter Not Connected")
+    st.markdown(api_status_markdown())
     
     # Model selection
     st.markdown("#### LLM Model")
     model = st.selectbox(
         "Select Model",
-        options=[
-            "google/gemini-2.5-flash-lite",
-            "anthropic/claude-3-haiku",
-            "openai/gpt-4o-mini",
-            "meta-llama/llama-3.2-3b-instruct"
-        ],
+        options=LLM_MODELS,
         index=0
     )
     
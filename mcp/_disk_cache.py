@@ -0,0 +1,112 @@
+"""
+On-disk cache of MCP tool results, so identical calls are reused across app restarts
+
+DataForSEO bills per call and its data changes slowly, so each successful result is
+stored as a JSON file named by a hash of (server, tool, arguments) and reused until
+its tool's TTL runs out. Stores also prune the directory now and then: files past
+every TTL are removed, then the oldest ones while it is over CACHE_MAX_BYTES.
+"""
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from . import _json
+
+CACHE_DIR = Path.home() / ".cache" / "seo-agent" / "mcp"
+
+# Seconds a stored result stays valid, by tool-name prefix (first match wins)
+TOOL_TTL_SECONDS = (
+    ("serp_", 6 * 3600),
+    ("on_page_", 6 * 3600),
+    ("keywords_data_google_trends", 12 * 3600),
+)
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+# Size the cache directory is pruned back to, oldest files first
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Minimum seconds between two prunes (each one lists the whole directory)
+PRUNE_INTERVAL_SECONDS = 600
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def _ttl(tool_name: str) -> int:
+    for prefix, ttl in TOOL_TTL_SECONDS:
+        if tool_name.startswith(prefix):
+            return ttl
+    return DEFAULT_TTL_SECONDS
+
+def _path(server_name: str, tool_name: str, arguments_json: str) -> Path:
+    digest = hashlib.blake2b(
+        f"{server_name}\0{tool_name}\0{arguments_json}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+def load(server_name: str, tool_name: str, arguments_json: str) -> Optional[Tuple[Dict, float]]:
+    """Stored result of this call and its age in seconds, or None when there is none or it has expired"""
+    path = _path(server_name, tool_name, arguments_json)
+    try:
+        age = time.time() - path.stat().st_mtime
+        if age > _ttl(tool_name):
+            path.unlink(missing_ok=True)
+            return None
+        return _json.loads(path.read_bytes()), max(age, 0.0)
+    except (OSError, ValueError):
+        return None
+
+def store(server_name: str, tool_name: str, arguments_json: str, result: Dict) -> None:
+    """Save a successful result of this call (atomically, so readers never see half a file)"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _path(server_name, tool_name, arguments_json)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(_json.dumps_line(result))
+        tmp_path.replace(path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"MCP result cache write failed: {e}")
+        return
+    _maybe_prune()
+
+def _maybe_prune():
+    global _last_prune
+    with _prune_lock:
+        if time.monotonic() - _last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = time.monotonic()
+    prune()
+
+def prune(max_bytes: int = CACHE_MAX_BYTES) -> int:
+    """Remove files older than the longest TTL, then the oldest until under `max_bytes`; returns how many were removed"""
+    max_age = max([DEFAULT_TTL_SECONDS] + [ttl for _, ttl in TOOL_TTL_SECONDS])
+    now = time.time()
+    files = []
+    removed = 0
+    try:
+        paths = list(CACHE_DIR.iterdir())
+    except OSError:
+        return 0
+
+    for path in paths:
+        try:
+            stat = path.stat()
+            if now - stat.st_mtime > max_age:
+                path.unlink()
+                removed += 1
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            pass
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            removed += 1
+            total -= size
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,55 @@
+"""
+JSON encoding for the MCP boundary: orjson when it is installed, the standard library otherwise
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, large payloads are then parsed whole
+    ijson = None
+
+# Payload size (characters) above which iter_items() streams the array instead of parsing the whole text
+STREAM_THRESHOLD = 64_000
+
+# orjson's decode error subclasses this, so one except clause covers both parsers
+JSONDecodeError = json.JSONDecodeError
+
+def dumps_line(message: Dict) -> bytes:
+    """One JSON-RPC message as a newline-terminated UTF-8 line"""
+    if orjson is not None:
+        # The newline is written by orjson into the same output buffer, no concatenated copy
+        return orjson.dumps(message, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(message).encode('utf-8') + b'\n'
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def iter_items(text: str, key: str = "items") -> Iterable[Any]:
+    """
+    Elements of the `key` array in a JSON object's text
+
+    Large payloads are streamed with ijson when it is installed, so items are built one at
+    a time instead of next to a fully parsed tree; small ones take the faster loads() path.
+    Every call parses afresh, so callers own (and may modify) the items they get.
+    """
+    if len(text) <= STREAM_THRESHOLD:
+        return loads(text).get(key, [])
+    if ijson is None:
+        return loads(text).get(key, [])
+    return _stream_items(text.encode('utf-8'), key)
+
+def _stream_items(data: bytes, key: str) -> Iterator[Any]:
+    try:
+        # use_float: numbers come back as float like json's, not Decimal
+        yield from ijson.items(data, f"{key}.item", use_float=True)
+    except ijson.JSONError as e:
+        raise JSONDecodeError(str(e), "", 0)
@@ -0,0 +1,327 @@
+"""
+Process pool shared by every MCPClient: one MCP server process per distinct server configuration
+"""
+import atexit
+import hashlib
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Any, Callable, Optional, Set
+from . import _json
+
+# MCP protocol revision announced in the initialize handshake
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+# Seconds an unreferenced server process is kept running for the next client before it is stopped
+POOL_IDLE_SECONDS = 300
+
+# Requests one server process works on at once; callers beyond this wait for a reply to free a slot
+MAX_IN_FLIGHT = 8
+
+def config_hash(command: str, args: List[str], env: Dict[str, str]) -> str:
+    """Pool key for a server configuration (env order doesn't matter, args order does)"""
+    config = {"cmd": command, "args": list(args), "env": sorted(env.items())}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+class MCPConnection:
+    """
+    One running MCP server process and its stdio JSON-RPC session
+
+    Requests from any thread are written under a lock; a reader thread matches each
+    response line to the waiting request by id, so up to MAX_IN_FLIGHT calls can be
+    in flight together.
+    Both pipes are binary: json parses the raw response bytes without a separate decode.
+    Transport failures surface as OSError: BrokenPipeError on write, ConnectionError once
+    the server has exited, TimeoutError when it doesn't answer.
+    """
+
+    def __init__(self, command: str, args: List[str], env: Dict[str, str]):
+        # Only spawns pay for the merged environment; with no overrides the child just inherits ours
+        process_env = {**os.environ, **env} if env else None
+
+        self.process = subprocess.Popen(
+            [command] + list(args),
+            env=process_env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+        self._closed = False
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self.process.poll() is None
+
+    def initialize(self, timeout: float):
+        """MCP handshake, sent once before the first tool call"""
+        self.request("initialize", {
+            "protocolVersion": MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "bmm-seo-agent", "version": "1.0"}
+        }, timeout)
+        self.notify("notifications/initialized")
+
+    def _send(self, message: Dict):
+        self._write(_json.dumps_line(message))
+
+    def _write(self, payload: bytes):
+        with self._write_lock:
+            self.process.stdin.write(payload)
+            self.process.stdin.flush()
+
+    def notify(self, method: str, params: Dict = None):
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._send(message)
+
+    def _register(self, request_id: int, future: Future):
+        """Track a request until it is answered; its in-flight slot is freed once the future is settled"""
+        future.add_done_callback(lambda _: self._in_flight.release())
+        with self._pending_lock:
+            if self._closed:
+                future.set_exception(ConnectionError(f"MCP server exited (code {self.process.poll()})"))
+                return
+            self._pending[request_id] = future
+
+    def _forget(self, request_ids: List[int]):
+        with self._pending_lock:
+            futures = [self._pending.pop(request_id, None) for request_id in request_ids]
+        # Abandoned (timed out) requests give their slot back; a late reply finds no one waiting
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+    def request(self, method: str, params: Dict, timeout: float) -> Dict:
+        """Send one JSON-RPC request and wait for the response carrying its id"""
+        request_id = next(self._ids)
+        future = Future()
+        if not self._in_flight.acquire(timeout=timeout):
+            raise TimeoutError(f"No free request slot for {method} within {timeout}s")
+        self._register(request_id, future)
+
+        try:
+            if not future.done():
+                self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"No response to {method} within {timeout}s")
+        finally:
+            self._forget([request_id])
+
+    def request_many(self, method: str, params_list: List[Dict], timeout: float) -> List[Any]:
+        """
+        Send several requests in one write and wait for all of them
+
+        Returns one entry per request, in order: the response, or the exception it failed with.
+        The server works on them concurrently, so the wait is roughly the slowest call.
+        """
+        request_ids = [next(self._ids) for _ in params_list]
+        futures = [Future() for _ in request_ids]
+        deadline = time.monotonic() + timeout
+
+        try:
+            # Requests that get a slot straight away go out in one write; when the slots run
+            # out, that write is sent and each further request waits for a reply to free one
+            lines = []
+            for request_id, params, future in zip(request_ids, params_list, futures):
+                if not self._in_flight.acquire(blocking=False):
+                    if lines:
+                        self._write(b''.join(lines))
+                        lines = []
+                    if not self._in_flight.acquire(timeout=max(0, deadline - time.monotonic())):
+                        future.set_exception(TimeoutError(f"No free request slot for {method} within {timeout}s"))
+                        continue
+                self._register(request_id, future)
+                if not future.done():
+                    lines.append(_json.dumps_line({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+            if lines:
+                self._write(b''.join(lines))
+
+            responses = []
+            for future in futures:
+                try:
+                    responses.append(future.result(timeout=max(0, deadline - time.monotonic())))
+                except FutureTimeoutError:
+                    responses.append(TimeoutError(f"No response to {method} within {timeout}s"))
+                except Exception as e:
+                    responses.append(e)
+            return responses
+        finally:
+            self._forget(request_ids)
+
+    def _read_responses(self):
+        """Reader thread: resolve waiting requests from stdout; server requests and notifications are skipped, log lines go to stderr"""
+        for line in self.process.stdout:
+            # JSON-RPC messages are one JSON object per line; anything else is server logging
+            if line[:1] != b'{':
+                sys.stderr.write(line.decode('utf-8', 'replace'))
+                continue
+            try:
+                response = _json.loads(line)
+            except ValueError:
+                continue
+            # Only responses settle requests: server-to-client requests carry a method and
+            # share the id space, notifications have no id
+            if "jsonrpc" not in response or "method" in response:
+                continue
+            if "result" not in response and "error" not in response:
+                continue
+
+            with self._pending_lock:
+                future = self._pending.get(response.get("id"))
+            if future is not None:
+                self._settle(future, result=response)
+
+        # EOF: the server is gone, fail everything still waiting
+        with self._pending_lock:
+            self._closed = True
+            waiting = list(self._pending.values())
+        try:
+            exit_code = self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            exit_code = None
+        error = ConnectionError(f"MCP server exited (code {exit_code})")
+        for future in waiting:
+            self._settle(future, error=error)
+
+    @staticmethod
+    def _settle(future: Future, result: Any = None, error: Optional[Exception] = None):
+        # The waiting caller may have given up (and cancelled the future) in the meantime
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def close(self):
+        self._closed = True
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+class McpInstancePool:
+    """
+    Shared MCP server processes keyed by config_hash(), reference-counted by owner
+
+    A process nobody references any more keeps running for POOL_IDLE_SECONDS, so
+    short-lived clients (one per button click) still find it warm.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, owner: int, factory: Callable[[], MCPConnection]) -> MCPConnection:
+        """
+        Running connection for `key`, created with `factory` when there is none; `owner` holds a reference
+
+        The factory (process start and handshake) runs outside the pool lock, so other keys are
+        not held up; callers wanting the same key meanwhile wait for that one start.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry["connection"] is None:
+                    starting = entry["ready"]
+                elif entry is None or not entry["connection"].alive:
+                    if entry is not None:
+                        self._cancel_idle_timer(entry)
+                    entry = {"connection": None, "refs": set(), "idle_timer": None, "ready": threading.Event()}
+                    self._entries[key] = entry
+                    break
+                else:
+                    self._cancel_idle_timer(entry)
+                    entry["refs"].add(owner)
+                    return entry["connection"]
+            # Another caller is starting this key's process: wait for it, then look again
+            starting.wait()
+
+        try:
+            connection = factory()
+        except BaseException:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry["ready"].set()
+            raise
+
+        with self._lock:
+            entry["connection"] = connection
+            entry["refs"].add(owner)
+            if self._entries.get(key) is not entry:
+                # close_all() ran while it was starting
+                connection.close()
+            entry["ready"].set()
+        return connection
+
+    def has_connection(self, key: str) -> bool:
+        """Whether `key` has a live connection (or one being started)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry["connection"] is None or entry["connection"].alive)
+
+    def release(self, key: str, owner: int):
+        """Drop `owner`'s reference; the last release starts the idle countdown"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            refs: Set[int] = entry["refs"]
+            refs.discard(owner)
+            if not refs and entry["idle_timer"] is None and entry["connection"] is not None:
+                timer = threading.Timer(POOL_IDLE_SECONDS, self._reap, args=(key, entry["connection"]))
+                timer.daemon = True
+                entry["idle_timer"] = timer
+                timer.start()
+
+    def discard(self, key: str, connection: MCPConnection):
+        """Stop a broken connection so the next acquire() starts a fresh process"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["connection"] is connection:
+                self._cancel_idle_timer(entry)
+                del self._entries[key]
+        connection.close()
+
+    def _reap(self, key: str, connection: MCPConnection):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["connection"] is not connection or entry["refs"]:
+                return
+            del self._entries[key]
+        connection.close()
+
+    def _cancel_idle_timer(self, entry: Dict[str, Any]):
+        if entry["idle_timer"] is not None:
+            entry["idle_timer"].cancel()
+            entry["idle_timer"] = None
+
+    def close_all(self):
+        """Stop every pooled process (registered to run at interpreter exit)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._cancel_idle_timer(entry)
+            if entry["connection"] is not None:
+                entry["connection"].close()
+
+pool = McpInstancePool()
+atexit.register(pool.close_all)
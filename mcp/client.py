@@ -1,50 +1,188 @@
+import copy
+import heapq
+import itertools
 import json
+import re
 import subprocess
 import tempfile
+import threading
+import time
 import os
-from typing import Dict, List, Any, Optional
+import shutil
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from . import _disk_cache, _json
+from ._pool import MCPConnection, config_hash, pool
 from .enhanced_processing import (
     process_ranked_keywords_data, process_competitor_data, 
-    process_search_volume_data, process_trends_data, process_content_analysis_data
+    process_search_volume_data, process_trends_data, process_content_analysis_data,
+    tool_result_items
 )
 
+# Seconds to wait for a server's answer to one JSON-RPC request
+MCP_CALL_TIMEOUT = 30
+
+# Times a call lost to a dead server process (exit, broken pipe) is resent on a fresh process;
+# timeouts are not retried, a stalled API call would most likely stall again
+MCP_CALL_RETRIES = 1
+
+# Successful tool results are reused for identical calls (same server, tool and arguments)
+# for this long; the least recently used are dropped beyond MCP_RESULT_CACHE_SIZE entries
+MCP_RESULT_TTL_SECONDS = 3600
+MCP_RESULT_CACHE_SIZE = 512
+
+# Quote characters removed from keywords before they are sent to the API
+_QUOTE_TABLE = str.maketrans('', '', '"\'')
+
+# (os.name, working directory) -> (command, args) that runs the DataForSEO MCP server
+_MCP_CMD_CACHE: Dict[Tuple[str, str], Tuple[str, List[str]]] = {}
+
+# Server config_hash -> the server's tools/list answer; a server's tools don't change while it runs
+_MCP_TOOLS_CACHE: Dict[str, List[Dict]] = {}
+
+# (config_hash, tool name, canonical arguments) -> (time stored, tool result), oldest use first
+_MCP_RESULT_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict]]" = OrderedDict()
+_MCP_RESULT_CACHE_LOCK = threading.Lock()
+
+# Tool-name prefix of each DataForSEO API module
+_DATAFORSEO_MODULE_PREFIXES = {
+    "SERP": "serp_",
+    "KEYWORDS_DATA": "keywords_data_",
+    "DATAFORSEO_LABS": "dataforseo_labs_",
+    "ON_PAGE": "on_page_",
+    "BUSINESS_DATA": "business_data_",
+    "DOMAIN_ANALYTICS": "domain_analytics_",
+    "BACKLINKS": "backlinks_"
+}
+
+# Keyword-type markers, matched as whole words (one C-level scan each, no word list built)
+_QUESTION_RE = re.compile(r"\b(?:what|how|why|when|where)\b")
+_COMPARISON_RE = re.compile(r"\b(?:best|top|vs|compare)\b")
+
+@lru_cache(maxsize=4096)
+def _keyword_type(keyword: str) -> str:
+    """Keyword type from its words (cached: responses repeat the same keywords and stems)"""
+    keyword_lower = keyword.lower()
+    
+    if _QUESTION_RE.search(keyword_lower):
+        return "Question"
+    elif _COMPARISON_RE.search(keyword_lower):
+        return "Comparison"
+    elif len(keyword.split(None, 3)) >= 4:
+        return "Long-tail"
+    else:
+        return "Related"
+
+@lru_cache(maxsize=64)
+def _language_code(language: str) -> str:
+    """API language code from a language name or code ("English" -> "en")"""
+    return language.lower()[:2]
+
+def _simplify_keyword(keyword: str) -> str:
+    """For very specific queries (more than 5 words), keep the first 4 words as the core terms"""
+    words = keyword.split(None, 5)
+    if len(words) > 5:
+        return ' '.join(words[:4])
+    return keyword
+
+def _cached_result(key: Tuple[str, str, str]) -> Optional[Dict]:
+    with _MCP_RESULT_CACHE_LOCK:
+        entry = _MCP_RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > MCP_RESULT_TTL_SECONDS:
+            del _MCP_RESULT_CACHE[key]
+            return None
+        _MCP_RESULT_CACHE.move_to_end(key)
+        # Each caller gets its own copy; the text blocks are immutable strings and aren't duplicated
+        return copy.deepcopy(entry[1])
+
+def _store_result(key: Tuple[str, str, str], result: Dict, age: float = 0.0):
+    # `age`: seconds since the result was fetched (a disk cache hit keeps its original fetch time)
+    # Stored as a copy, so the caller that fetched the result may modify its own
+    result = copy.deepcopy(result)
+    with _MCP_RESULT_CACHE_LOCK:
+        _MCP_RESULT_CACHE[key] = (time.monotonic() - age, result)
+        _MCP_RESULT_CACHE.move_to_end(key)
+        while len(_MCP_RESULT_CACHE) > MCP_RESULT_CACHE_SIZE:
+            _MCP_RESULT_CACHE.popitem(last=False)
+
+def _empty_volume_row(keyword: str) -> Dict[str, Any]:
+    """Search volume row for a keyword the API returned no data for (same fields as a processed row)"""
+    return {
+        "keyword": keyword,
+        "search_volume": 0,
+        "cpc": 0.0,
+        "competition": 0.0,
+        "competition_level": "UNKNOWN",
+        "monthly_searches": [],
+        "low_bid": 0.0,
+        "high_bid": 0.0
+    }
+
+# Pool reference ids, one per call, so concurrent calls from one client hold separate references
+_LEASE_IDS = itertools.count(1)
+
+# SERP records stay plain dicts (the app feeds them to DataFrames and .get()s their fields);
+# domains are interned since the same few sites recur across results and cached SERPs
+def _organic_result(item: Dict, position: int) -> Dict[str, Any]:
+    return {
+        "position": item.get("rank_absolute", position),
+        "title": item.get("title", ""),
+        "url": item.get("url", ""),
+        "description": item.get("description", ""),
+        "domain": sys.intern(item.get("domain") or ""),
+        "type": "organic"
+    }
+
+def _local_pack_result(item: Dict, position: int) -> Dict[str, Any]:
+    return {
+        "position": item.get("rank_absolute", position),
+        "title": item.get("title", ""),
+        "url": item.get("url", ""),
+        "description": item.get("description", ""),
+        "domain": sys.intern(item.get("domain") or ""),
+        "type": "local_pack",
+        "rating": item.get("rating", {}).get("value", 0),
+        "phone": item.get("phone", "")
+    }
+
+def _featured_snippet_result(item: Dict, position: int) -> Dict[str, Any]:
+    return {
+        "position": 0,  # Featured snippets are always at the top
+        "title": item.get("title", ""),
+        "url": item.get("url", ""),
+        "description": item.get("featured_title", ""),
+        "domain": sys.intern(item.get("domain") or ""),
+        "type": "featured_snippet"
+    }
+
+# SERP item type -> (result builder, whether the item takes the next fallback position)
+_SERP_ITEM_BUILDERS = {
+    "organic": (_organic_result, True),
+    "local_pack": (_local_pack_result, True),
+    "featured_snippet": (_featured_snippet_result, False)
+}
+
 class MCPClient:
     """
     Client for interacting with MCP servers
+    
+    Each configured server runs as one long-lived process, shared through the module
+    pool with every other client using the same command, arguments and credentials.
     """
     
     def __init__(self):
         self.servers = {}
-        self.active_connections = {}
+        self.active_connections = {}  # lease id -> pool key, for calls in flight
     
     def configure_dataforseo_server(self):
         """Configure DataForSEO MCP server"""
         try:
-            # Check if running on Streamlit Cloud
-            if os.getenv("STREAMLIT_RUNTIME_ENV") == "cloud":
-                # Try to install MCP server if not already installed
-                try:
-                    subprocess.run(["which", "dataforseo-mcp-server"], check=True, capture_output=True)
-                    print("✅ DataForSEO MCP server already installed")
-                except subprocess.CalledProcessError:
-                    print("📦 Installing DataForSEO MCP server...")
-                    try:
-                        # Install globally without sudo (Streamlit Cloud allows this)
-                        result = subprocess.run(
-                            ["npm", "install", "-g", "dataforseo-mcp-server"],
-                            capture_output=True,
-                            text=True,
-                            timeout=60
-                        )
-                        if result.returncode == 0:
-                            print("✅ DataForSEO MCP server installed successfully")
-                        else:
-                            print(f"❌ Failed to install MCP server: {result.stderr}")
-                            raise Exception(f"Failed to install MCP server: {result.stderr}")
-                    except Exception as install_error:
-                        print(f"❌ Installation error: {install_error}")
-                        raise
-            
             # Check required environment variables
             username = os.getenv("DATAFORSEO_USERNAME")
             password = os.getenv("DATAFORSEO_PASSWORD")
@@ -52,175 +190,321 @@ class MCPClient:
             if not username or not password:
                 raise Exception("Missing required environment variables: DATAFORSEO_USERNAME and DATAFORSEO_PASSWORD")
             
-            # Official DataForSEO MCP server configuration
-            # Try different ways to run the MCP server (Windows compatibility)
-            mcp_command = None
-            
-            # Method 1: Try with npx (works with local install)
-            try:
-                result = subprocess.run(["npx", "--version"], capture_output=True, timeout=2)
-                if result.returncode == 0:
-                    # Check if MCP server is available via npx
-                    result = subprocess.run(["npx", "dataforseo-mcp-server", "--version"], 
-                                         capture_output=True, timeout=5)
-                    if result.returncode == 0:
-                        mcp_command = "npx"
-                        mcp_args = ["dataforseo-mcp-server"]
-                        print("✅ Using npx to run DataForSEO MCP server")
-            except:
-                pass
-            
-            # Method 2: Try direct command (global install)
-            if not mcp_command:
-                try:
-                    result = subprocess.run(["dataforseo-mcp-server", "--version"], 
-                                         capture_output=True, timeout=5)
-                    if result.returncode == 0:
-                        mcp_command = "dataforseo-mcp-server"
-                        mcp_args = []
-                        print("✅ Using global DataForSEO MCP server")
-                except:
-                    pass
-            
-            # Method 3: Try with node_modules/.bin (local install)
-            if not mcp_command:
-                local_bin = os.path.join(os.getcwd(), "node_modules", ".bin", "dataforseo-mcp-server")
-                if os.path.exists(local_bin):
-                    mcp_command = local_bin
-                    mcp_args = []
-                    print(f"✅ Using local MCP server at {local_bin}")
-            
-            # Method 4: Windows-specific global npm path
-            if not mcp_command and os.name == 'nt':
-                npm_prefix = subprocess.run(["npm", "config", "get", "prefix"], 
-                                          capture_output=True, text=True, timeout=5).stdout.strip()
-                global_bin = os.path.join(npm_prefix, "dataforseo-mcp-server.cmd")
-                if os.path.exists(global_bin):
-                    mcp_command = global_bin
-                    mcp_args = []
-                    print(f"✅ Using Windows global MCP server at {global_bin}")
-            
-            if not mcp_command:
-                print("❌ DataForSEO MCP server not found. Please install with: npm install -g dataforseo-mcp-server")
-                raise Exception("DataForSEO MCP server not installed or not in PATH")
+            # Discovery runs subprocess probes, so it happens once per process and working directory
+            cache_key = (os.name, os.getcwd())
+            if cache_key not in _MCP_CMD_CACHE:
+                _MCP_CMD_CACHE[cache_key] = self._discover_mcp_command()
+            mcp_command, mcp_args = _MCP_CMD_CACHE[cache_key]
             
+            env = {
+                "DATAFORSEO_USERNAME": username,
+                "DATAFORSEO_PASSWORD": password
+            }
             self.servers["dataforseo"] = {
                 "command": mcp_command,
                 "args": mcp_args,
-                "env": {
-                    "DATAFORSEO_USERNAME": username,
-                    "DATAFORSEO_PASSWORD": password
-                }
+                "env": env,
+                "config_hash": config_hash(mcp_command, mcp_args, env)
             }
             
             print("✅ Official DataForSEO MCP server configured")
+            
+            # Start the server in the background so the first tool call finds it ready; a client
+            # built while the pool already runs it (every click after the first) has nothing to warm
+            if not pool.has_connection(self.servers["dataforseo"]["config_hash"]):
+                threading.Thread(target=self._prewarm, args=("dataforseo",), daemon=True).start()
             return True
             
         except Exception as e:
             print(f"❌ Failed to configure DataForSEO MCP server: {str(e)}")
             raise
     
+    def _discover_mcp_command(self) -> Tuple[str, List[str]]:
+        """Find how to run the DataForSEO MCP server (installing it first on Streamlit Cloud)"""
+        # Check if running on Streamlit Cloud
+        if os.getenv("STREAMLIT_RUNTIME_ENV") == "cloud":
+            # Try to install MCP server if not already installed
+            if shutil.which("dataforseo-mcp-server"):
+                print("✅ DataForSEO MCP server already installed")
+            else:
+                print("📦 Installing DataForSEO MCP server...")
+                try:
+                    # Install globally without sudo (Streamlit Cloud allows this)
+                    result = subprocess.run(
+                        ["npm", "install", "-g", "dataforseo-mcp-server"],
+                        capture_output=True,
+                        text=True,
+                        timeout=60
+                    )
+                    if result.returncode == 0:
+                        print("✅ DataForSEO MCP server installed successfully")
+                    else:
+                        print(f"❌ Failed to install MCP server: {result.stderr}")
+                        raise Exception(f"Failed to install MCP server: {result.stderr}")
+                except Exception as install_error:
+                    print(f"❌ Installation error: {install_error}")
+                    raise
+        
+        # Official DataForSEO MCP server configuration
+        # Try different ways to run the MCP server (Windows compatibility)
+        mcp_command = None
+        
+        # Method 1: Try with npx (works with local install). Having npx doesn't mean the package
+        # resolves, so this is the one probe that still runs a process
+        if shutil.which("npx"):
+            try:
+                result = subprocess.run(["npx", "dataforseo-mcp-server", "--version"], 
+                                     capture_output=True, timeout=5)
+                if result.returncode == 0:
+                    mcp_command = "npx"
+                    mcp_args = ["dataforseo-mcp-server"]
+                    print("✅ Using npx to run DataForSEO MCP server")
+            except:
+                pass
+        
+        # Method 2: Try direct command (global install); being on PATH is enough, since a broken
+        # install surfaces on the first tool call anyway
+        if not mcp_command and shutil.which("dataforseo-mcp-server"):
+            mcp_command = "dataforseo-mcp-server"
+            mcp_args = []
+            print("✅ Using global DataForSEO MCP server")
+        
+        # Method 3: Try with node_modules/.bin (local install)
+        if not mcp_command:
+            local_bin = os.path.join(os.getcwd(), "node_modules", ".bin", "dataforseo-mcp-server")
+            if os.path.exists(local_bin):
+                mcp_command = local_bin
+                mcp_args = []
+                print(f"✅ Using local MCP server at {local_bin}")
+        
+        # Method 4: Windows-specific global npm path (asking npm for its prefix only when PATH lookup fails)
+        if not mcp_command and os.name == 'nt':
+            global_bin = shutil.which("dataforseo-mcp-server.cmd")
+            if not global_bin:
+                npm_prefix = subprocess.run(["npm", "config", "get", "prefix"], 
+                                          capture_output=True, text=True, timeout=5).stdout.strip()
+                global_bin = os.path.join(npm_prefix, "dataforseo-mcp-server.cmd")
+            if os.path.exists(global_bin):
+                mcp_command = global_bin
+                mcp_args = []
+                print(f"✅ Using Windows global MCP server at {global_bin}")
+        
+        if not mcp_command:
+            print("❌ DataForSEO MCP server not found. Please install with: npm install -g dataforseo-mcp-server")
+            raise Exception("DataForSEO MCP server not installed or not in PATH")
+        
+        return mcp_command, mcp_args
+    
+    @contextmanager
+    def _connection(self, server_name: str) -> Iterator[MCPConnection]:
+        """
+        Pooled session for a server for the length of one call, starting the process and MCP
+        handshake if none is running
+
+        Each call holds its own pool reference and releases it on return, so the idle countdown
+        starts when the last call finishes rather than whenever a client is garbage collected.
+        """
+        server_config = self.servers[server_name]
+        key = server_config["config_hash"]
+        
+        def start_server() -> MCPConnection:
+            connection = MCPConnection(server_config["command"], server_config["args"], server_config.get("env", {}))
+            try:
+                connection.initialize(MCP_CALL_TIMEOUT)
+            except Exception:
+                connection.close()
+                raise
+            return connection
+        
+        lease = next(_LEASE_IDS)
+        connection = pool.acquire(key, lease, start_server)
+        self.active_connections[lease] = key
+        try:
+            yield connection
+        finally:
+            self._release(lease)
+    
+    def _release(self, lease: int):
+        key = self.active_connections.pop(lease, None)
+        if key is not None:
+            pool.release(key, lease)
+    
+    def _prewarm(self, server_name: str):
+        """Background start of a server's process and handshake; a tool call arriving meanwhile waits in the pool"""
+        try:
+            with self._connection(server_name):
+                pass
+            self.list_tools(server_name)
+        except Exception as e:
+            print(f"MCP server prewarm failed (the first tool call will retry): {str(e)}")
+    
+    def close(self):
+        """Release the pool references of this client's calls still in flight (finished calls already have)"""
+        for lease in list(self.active_connections):
+            self._release(lease)
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
     def call_tool(self, server_name: str, tool_name: str, arguments: Dict = None) -> Dict:
         """
-        Call a tool on an MCP server using proper stdio communication
+        Call a tool on an MCP server over its persistent stdio session
+        """
+        return self.call_tool_many(server_name, [(tool_name, arguments)])[0]
+    
+    def call_tool_many(self, server_name: str, calls: List[Tuple[str, Dict]]) -> List[Dict]:
+        """
+        Call several independent tools on an MCP server in one batch
+        
+        All requests are written back-to-back and answered as the server finishes them, so
+        the batch takes about as long as its slowest call. Returns one result per
+        (tool_name, arguments) pair, in order, each shaped like call_tool()'s.
+        Calls made with the same arguments within MCP_RESULT_TTL_SECONDS are answered
+        from the result cache without a request, older ones from the on-disk cache
+        while their tool's TTL lasts.
         """
         try:
             if server_name not in self.servers:
                 raise Exception(f"Server {server_name} not configured")
             
-            server_config = self.servers[server_name]
-            
-            # Prepare MCP request
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments or {}
-                }
-            }
+            key = self.servers[server_name]["config_hash"]
+            cache_keys = [
+                (key, tool_name, json.dumps(arguments or {}, sort_keys=True, default=str))
+                for tool_name, arguments in calls
+            ]
+            
+            # Once the server's tool list is known, calls to tools it doesn't offer are not sent
+            tools = _MCP_TOOLS_CACHE.get(key)
+            known_tools = {tool.get("name") for tool in tools} if tools else None
+            responses: List[Any] = []
+            for (tool_name, _), cache_key in zip(calls, cache_keys):
+                if known_tools is not None and tool_name not in known_tools:
+                    responses.append(Exception(f"Tool {tool_name} not offered by {server_name} server"))
+                    continue
+                cached = _cached_result(cache_key)
+                if cached is None:
+                    # Results survive restarts on disk, with longer per-tool TTLs than in memory
+                    stored = _disk_cache.load(server_name, tool_name, cache_key[2])
+                    if stored is not None:
+                        cached, age = stored
+                        # Promoted with its fetch time, so memory never serves it past the disk TTL
+                        if age < MCP_RESULT_TTL_SECONDS:
+                            _store_result(cache_key, cached, age)
+                responses.append(None if cached is None else {"result": cached})
+            sendable = [index for index, response in enumerate(responses) if response is None]
             
-            # Execute MCP server command with proper stdio
-            env = os.environ.copy()
-            env.update(server_config.get("env", {}))
-            
-            cmd = server_config["command"]
-            args = server_config["args"]
-            
-            # Start the MCP server process
             try:
-                process = subprocess.Popen(
-                    [cmd] + args,
-                    env=env,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
+                if sendable:
+                    sent = self._request_tools(server_name, [
+                        {"name": calls[index][0], "arguments": calls[index][1] or {}}
+                        for index in sendable
+                    ])
+                    for index, response in zip(sendable, sent):
+                        responses[index] = response
+                        # Failed calls, including tool-level failures (isError), are not cached
+                        if isinstance(response, dict) and "error" not in response:
+                            result = response.get("result", {})
+                            if not result.get("isError"):
+                                _store_result(cache_keys[index], result)
+                                _disk_cache.store(server_name, calls[index][0], cache_keys[index][2], result)
             except FileNotFoundError:
+                cmd = self.servers[server_name]["command"]
                 print(f"❌ MCP server command '{cmd}' not found. Using fallback mode.")
-                return {"error": f"MCP server '{cmd}' not installed"}
-            
-            # Send request and get response
-            request_json = json.dumps(request) + '\n'
-            stdout, stderr = process.communicate(input=request_json, timeout=30)
-            
-            if process.returncode != 0:
-                raise Exception(f"MCP server error: {stderr}")
-            
-            # Parse response - get the last line that looks like JSON
-            lines = stdout.strip().split('\n')
-            response_line = None
-            
-            for line in reversed(lines):
-                line = line.strip()
-                if line.startswith('{"') and '"jsonrpc"' in line:
-                    response_line = line
-                    break
-            
-            if not response_line:
-                raise Exception(f"No valid JSON response found in: {stdout}")
-            
-            response = json.loads(response_line)
-            
-            if "error" in response:
-                raise Exception(f"Tool error: {response['error']}")
-            
-            return response.get("result", {})
-                    
+                return [{"error": f"MCP server '{cmd}' not installed"} for _ in calls]
+            
+            results = []
+            for (tool_name, _), response in zip(calls, responses):
+                if isinstance(response, Exception):
+                    print(f"MCP tool call failed: {tool_name}: {str(response)}")
+                    results.append({"error": str(response)})
+                elif "error" in response:
+                    print(f"MCP tool call failed: {tool_name}: {response['error']}")
+                    results.append({"error": f"Tool error: {response['error']}"})
+                else:
+                    results.append(response.get("result", {}))
+            
+            return results
+        
         except Exception as e:
             print(f"MCP tool call failed: {str(e)}")
-            return {"error": str(e)}
+            return [{"error": str(e)} for _ in calls]
+    
+    def _request_tools(self, server_name: str, params_list: List[Dict]) -> List[Any]:
+        """
+        Send tools/call requests, reconnecting once for the calls a dead server process lost
+        
+        Returns one entry per request, in order: the response, or the exception it failed with.
+        Any transport failure (OSError) drops the pooled process, so the retry (and the next
+        call) starts a fresh one; other errors, such as unserializable arguments, are raised
+        and leave the process alone.
+        """
+        key = self.servers[server_name]["config_hash"]
+        responses: List[Any] = [None] * len(params_list)
+        pending = list(range(len(params_list)))
+        
+        for attempt in range(MCP_CALL_RETRIES + 1):
+            with self._connection(server_name) as connection:
+                try:
+                    batch = connection.request_many("tools/call", [params_list[i] for i in pending], MCP_CALL_TIMEOUT)
+                except OSError as e:
+                    # The write itself failed: broken pipe or the server already gone
+                    batch = [e] * len(pending)
+                
+                if any(isinstance(response, OSError) for response in batch):
+                    pool.discard(key, connection)
+            
+            lost = []
+            for index, response in zip(pending, batch):
+                responses[index] = response
+                # Timeouts are not resent (TimeoutError is an OSError too, so it is checked first)
+                if isinstance(response, OSError) and not isinstance(response, TimeoutError):
+                    lost.append(index)
+            
+            if not lost or attempt == MCP_CALL_RETRIES:
+                break
+            print(f"MCP server connection lost ({str(responses[lost[0]])}), reconnecting...")
+            pending = lost
+        
+        return responses
+    
+    def invalidate_tools(self, server_name: str):
+        """Forget a server's cached tool list, so the next list_tools() asks the server again"""
+        if server_name in self.servers:
+            _MCP_TOOLS_CACHE.pop(self.servers[server_name]["config_hash"], None)
     
     def list_tools(self, server_name: str) -> List[Dict]:
-        """List available tools on an MCP server"""
+        """List available tools on an MCP server (asked once per server process, then cached)"""
         try:
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/list"
-            }
-            
-            # This is a simplified version - in practice, you'd establish a proper MCP connection
-            # For now, return expected DataForSEO tools
-            if server_name == "dataforseo":
-                return [
-                    {
-                        "name": "dataforseo_keywords_data",
-                        "description": "Get keyword suggestions and search volume data"
-                    },
-                    {
-                        "name": "dataforseo_serp_analysis", 
-                        "description": "Analyze SERP results for keywords"
-                    },
-                    {
-                        "name": "dataforseo_keyword_difficulty",
-                        "description": "Get keyword difficulty scores"
-                    }
-                ]
+            if server_name not in self.servers:
+                raise Exception(f"Server {server_name} not configured")
             
-            return []
+            key = self.servers[server_name]["config_hash"]
+            if key not in _MCP_TOOLS_CACHE:
+                with self._connection(server_name) as connection:
+                    tools = []
+                    params: Dict[str, Any] = {}
+                    # The list may come in pages; nextCursor asks for the following one
+                    while True:
+                        try:
+                            response = connection.request("tools/list", params, MCP_CALL_TIMEOUT)
+                        except OSError:
+                            pool.discard(key, connection)
+                            raise
+                        if "error" in response:
+                            # No usable listing: cached empty, so tool calls are sent unchecked
+                            print(f"Failed to list tools: {response['error']}")
+                            break
+                        result = response.get("result", {})
+                        tools.extend(result.get("tools", []))
+                        if not result.get("nextCursor"):
+                            break
+                        params = {"cursor": result["nextCursor"]}
+                    _MCP_TOOLS_CACHE[key] = tools
+            
+            return _MCP_TOOLS_CACHE[key]
             
         except Exception as e:
             print(f"Failed to list tools: {str(e)}")
@@ -239,18 +523,26 @@ class DataForSEOMCP:
         # Configure MCP server - no fallback
         if not self.client.configure_dataforseo_server():
             raise Exception("❌ DataForSEO MCP server configuration failed. Please check environment variables and server installation.")
-        
-        # Available API modules based on research
-        self.available_modules = {
-            "SERP": ["serp_organic_live_advanced", "serp_youtube_organic_live_advanced"],
-            "KEYWORDS_DATA": ["keywords_data_google_ads_search_volume", "keywords_data_google_trends_explore"],
-            "DATAFORSEO_LABS": ["dataforseo_labs_google_keyword_ideas", "dataforseo_labs_google_ranked_keywords", "dataforseo_labs_google_competitors_domain"],
-            "ON_PAGE": ["on_page_content_parsing", "on_page_instant_pages"],
-            "BUSINESS_DATA": [],
-            "DOMAIN_ANALYTICS": [],
-            "BACKLINKS": []
+    
+    @property
+    def available_modules(self) -> Dict[str, List[str]]:
+        """Tools the running server offers, grouped by API module"""
+        names = [tool.get("name", "") for tool in self.client.list_tools("dataforseo")]
+        return {
+            module: [name for name in names if name.startswith(prefix)]
+            for module, prefix in _DATAFORSEO_MODULE_PREFIXES.items()
         }
     
+    def close(self):
+        """Release the shared MCP server process (it stays warm in the pool for other callers)"""
+        self.client.close()
+    
+    def __enter__(self) -> "DataForSEOMCP":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def get_keyword_suggestions(
         self,
         seed_keyword: str,
@@ -261,23 +553,8 @@ class DataForSEOMCP:
         """Get keyword suggestions via MCP"""
         
         try:
-            # Preprocess seed keyword for better results  
-            processed_keyword = self._preprocess_keywords([seed_keyword])[0]
-            if len(seed_keyword.split()) > 4:
-                processed_keyword = self._simplify_keywords([seed_keyword])[0]
-                print(f"🔑 Simplified keyword query: '{seed_keyword}' → '{processed_keyword}'")
-            
             # Call MCP server
-            result = self.client.call_tool(
-                "dataforseo",
-                "dataforseo_labs_google_keyword_ideas",
-                {
-                    "keywords": [processed_keyword],
-                    "location_name": location,
-                    "language_code": language.lower()[:2],
-                    "limit": limit
-                }
-            )
+            result = self.client.call_tool("dataforseo", *self._keyword_ideas_call(seed_keyword, location, language, limit))
             
             if result.get("error"):
                 raise Exception(f"MCP keyword suggestions failed: {result['error']}")
@@ -297,23 +574,8 @@ class DataForSEOMCP:
         """Get SERP analysis via MCP"""
         
         try:
-            # Preprocess keyword for better results
-            processed_keyword = self._preprocess_keywords([keyword])[0]
-            if len(keyword.split()) > 4:
-                processed_keyword = self._simplify_keywords([keyword])[0]
-                print(f"🔍 Simplified SERP query: '{keyword}' → '{processed_keyword}'")
-            
             # Call MCP server
-            result = self.client.call_tool(
-                "dataforseo",
-                "serp_organic_live_advanced",
-                {
-                    "keyword": processed_keyword,
-                    "location_name": location,
-                    "language_code": language.lower()[:2],
-                    "depth": 10
-                }
-            )
+            result = self.client.call_tool("dataforseo", *self._serp_call(keyword, location, language))
             
             if result.get("error"):
                 raise Exception(f"MCP SERP analysis failed: {result['error']}")
@@ -334,20 +596,7 @@ class DataForSEOMCP:
         """Get keywords that a domain is ranking for"""
         
         try:
-            # Request more data to ensure we get enough results
-            # Some domains may have limited rankings, so we ask for more
-            actual_limit = max(limit * 2, 200)  # Request double or at least 200
-            
-            result = self.client.call_tool(
-                "dataforseo",
-                "dataforseo_labs_google_ranked_keywords",
-                {
-                    "target": target_domain,
-                    "location_name": location,
-                    "language_code": language.lower()[:2],
-                    "limit": actual_limit  # Request more to account for filtering
-                }
-            )
+            result = self.client.call_tool("dataforseo", *self._ranked_keywords_call(target_domain, location, language, limit))
             
             if result.get("error"):
                 raise Exception(f"MCP ranked keywords failed: {result['error']}")
@@ -370,16 +619,7 @@ class DataForSEOMCP:
         """Get competitor domains for a target domain"""
         
         try:
-            result = self.client.call_tool(
-                "dataforseo",
-                "dataforseo_labs_google_competitors_domain",
-                {
-                    "target": target_domain,
-                    "location_name": location,
-                    "language_code": language.lower()[:2],
-                    "limit": limit
-                }
-            )
+            result = self.client.call_tool("dataforseo", *self._competitors_call(target_domain, location, language, limit))
             
             if result.get("error"):
                 raise Exception(f"MCP competitor analysis failed: {result['error']}")
@@ -390,30 +630,115 @@ class DataForSEOMCP:
             print(f"MCP competitor analysis failed: {str(e)}")
             raise
     
+    # Tool name and arguments for each request, shared by the get_* methods and gather_seo_bundle()
+    def _keyword_ideas_call(self, seed_keyword: str, location: str, language: str, limit: int) -> Tuple[str, Dict]:
+        # Preprocess seed keyword for better results  
+        normalized_keyword = self._preprocess_keywords([seed_keyword])[0]
+        processed_keyword = _simplify_keyword(normalized_keyword)
+        # Logged only when words were dropped, not for quote stripping or truncation
+        if processed_keyword is not normalized_keyword:
+            print(f"🔑 Simplified keyword query: '{seed_keyword}' → '{processed_keyword}'")
+        
+        return "dataforseo_labs_google_keyword_ideas", {
+            "keywords": [processed_keyword],
+            "location_name": location,
+            "language_code": _language_code(language),
+            "limit": limit
+        }
+    
+    def _serp_call(self, keyword: str, location: str, language: str) -> Tuple[str, Dict]:
+        # Preprocess keyword for better results
+        normalized_keyword = self._preprocess_keywords([keyword])[0]
+        processed_keyword = _simplify_keyword(normalized_keyword)
+        # Logged only when words were dropped, not for quote stripping or truncation
+        if processed_keyword is not normalized_keyword:
+            print(f"🔍 Simplified SERP query: '{keyword}' → '{processed_keyword}'")
+        
+        return "serp_organic_live_advanced", {
+            "keyword": processed_keyword,
+            "location_name": location,
+            "language_code": _language_code(language),
+            "depth": 10
+        }
+    
+    def _ranked_keywords_call(self, target_domain: str, location: str, language: str, limit: int) -> Tuple[str, Dict]:
+        # Request more data to ensure we get enough results
+        # Some domains may have limited rankings, so we ask for more
+        actual_limit = max(limit * 2, 200)  # Request double or at least 200
+        
+        return "dataforseo_labs_google_ranked_keywords", {
+            "target": target_domain,
+            "location_name": location,
+            "language_code": _language_code(language),
+            "limit": actual_limit  # Request more to account for filtering
+        }
+    
+    def _competitors_call(self, target_domain: str, location: str, language: str, limit: int) -> Tuple[str, Dict]:
+        return "dataforseo_labs_google_competitors_domain", {
+            "target": target_domain,
+            "location_name": location,
+            "language_code": _language_code(language),
+            "limit": limit
+        }
+    
+    def _trends_call(self, keywords: List[str], location: str, time_range: str) -> Tuple[str, Dict]:
+        # Preprocess and simplify keywords for trends
+        normalized_keywords = self._preprocess_keywords(keywords)
+        processed_keywords = [_simplify_keyword(kw) for kw in normalized_keywords]
+        if processed_keywords != normalized_keywords:
+            print(f"📈 Simplified query for trends: {processed_keywords}")
+        # Simplified keywords often collapse onto each other; each comparison series is paid for once
+        processed_keywords = list(dict.fromkeys(processed_keywords))
+        
+        return "keywords_data_google_trends_explore", {
+            "keywords": processed_keywords,
+            "location_name": location,
+            "time_range": time_range,
+            "type": "web"
+        }
+    
+    def gather_seo_bundle(
+        self,
+        keyword: str,
+        domain: Optional[str] = None,
+        location: str = "United States",
+        language: str = "English",
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Research a keyword (and optionally a domain) with one batch of concurrent MCP calls
+        
+        Returns 'serp', 'keyword_suggestions' and 'trends', plus 'ranked_keywords' and
+        'competitors' when a domain is given, each processed like the matching get_* method's
+        result, or None when that call failed.
+        """
+        calls = {
+            "serp": self._serp_call(keyword, location, language),
+            "keyword_suggestions": self._keyword_ideas_call(keyword, location, language, limit),
+            "trends": self._trends_call([keyword], location, "past_12_months")
+        }
+        if domain:
+            calls["ranked_keywords"] = self._ranked_keywords_call(domain, location, language, limit)
+            calls["competitors"] = self._competitors_call(domain, location, language, limit)
+        
+        processors = {
+            "serp": self._process_serp_data,
+            "keyword_suggestions": self._process_keyword_data,
+            "trends": process_trends_data,
+            "ranked_keywords": lambda result: process_ranked_keywords_data(result)[:limit],
+            "competitors": process_competitor_data
+        }
+        
+        results = self.client.call_tool_many("dataforseo", list(calls.values()))
+        return {
+            name: None if result.get("error") else processors[name](result)
+            for name, result in zip(calls, results)
+        }
+    
     def _preprocess_keywords(self, keywords: List[str]) -> List[str]:
         """Preprocess keywords for better API results"""
-        processed = []
-        for kw in keywords:
-            # Truncate very long keywords
-            if len(kw) > 80:
-                kw = kw[:80]
-            # Remove special characters that might cause issues
-            kw = kw.replace('"', '').replace("'", '')
-            processed.append(kw)
-        return processed
-    
-    def _simplify_keywords(self, keywords: List[str]) -> List[str]:
-        """Simplify complex keywords to get better data"""
-        simplified = []
-        for kw in keywords:
-            # For very specific queries, extract core terms
-            if len(kw.split()) > 5:
-                # Take first 3-4 words for better results
-                words = kw.split()[:4]
-                simplified.append(' '.join(words))
-            else:
-                simplified.append(kw)
-        return simplified
+        # Truncate very long keywords and remove quote characters that might cause issues
+        return [kw[:80].translate(_QUOTE_TABLE) for kw in keywords]
     
     def get_search_volume_data(
         self,
@@ -424,26 +749,33 @@ class DataForSEOMCP:
         """Get search volume data for specific keywords"""
         
         try:
-            # Preprocess long/complex keywords
+            # Preprocess long/complex keywords, and query each distinct keyword once
             processed_keywords = self._preprocess_keywords(keywords)
+            unique_keywords = list(dict.fromkeys(processed_keywords))
             
             result = self.client.call_tool(
                 "dataforseo",
                 "keywords_data_google_ads_search_volume",
                 {
-                    "keywords": processed_keywords,
+                    "keywords": unique_keywords,
                     "location_name": location,
-                    "language_code": language.lower()[:2]
+                    "language_code": _language_code(language)
                 }
             )
             
             if result.get("error"):
                 raise Exception(f"MCP search volume failed: {result['error']}")
             
-            volume_data = process_search_volume_data(result)
+            # Rows are matched back by their keyword (the API may reorder, drop or lowercase them):
+            # one row per requested keyword, repeats as copies, an empty row for any it didn't return
+            rows_by_keyword = {row["keyword"].lower(): row for row in process_search_volume_data(result)}
+            volume_data = [
+                dict(rows_by_keyword.get(kw.lower()) or _empty_volume_row(kw))
+                for kw in processed_keywords
+            ]
             # Add warning for zero-volume keywords
-            for i, vd in enumerate(volume_data):
-                if vd.get('search_volume', 0) == 0 and len(keywords[i]) > 30:
+            for kw, vd in zip(keywords, volume_data):
+                if vd.get('search_volume', 0) == 0 and len(kw) > 30:
                     vd['note'] = 'Query too specific - try shorter keywords'
             return volume_data
             
@@ -460,23 +792,10 @@ class DataForSEOMCP:
         """Get Google Trends data for keywords"""
         
         try:
-            # Preprocess and simplify keywords for trends
-            processed_keywords = self._preprocess_keywords(keywords)
-            # For trends, simplify complex queries more aggressively
-            if any(len(kw.split()) > 4 for kw in processed_keywords):
-                processed_keywords = self._simplify_keywords(processed_keywords)
-                print(f"📈 Simplified query for trends: {processed_keywords}")
+            tool_name, arguments = self._trends_call(keywords, location, time_range)
+            processed_keywords = arguments["keywords"]
             
-            result = self.client.call_tool(
-                "dataforseo",
-                "keywords_data_google_trends_explore",
-                {
-                    "keywords": processed_keywords,
-                    "location_name": location,
-                    "time_range": time_range,
-                    "type": "web"
-                }
-            )
+            result = self.client.call_tool("dataforseo", tool_name, arguments)
             
             if result.get("error"):
                 raise Exception(f"MCP trends analysis failed: {result['error']}")
@@ -533,116 +852,55 @@ class DataForSEOMCP:
     def _process_keyword_data(self, raw_data: Dict) -> List[Dict[str, Any]]:
         """Process raw keyword data from MCP response"""
         keywords = []
+        append = keywords.append
         
-        # Parse the JSON text content from MCP response
         try:
-            import json
-            if "content" in raw_data and raw_data["content"]:
-                content_text = raw_data["content"][0].get("text", "{}")
-                parsed_data = json.loads(content_text)
-                items = parsed_data.get("items", [])
-            else:
-                items = []
-            
-            for item in items:
+            for item in tool_result_items(raw_data):
                 # Extract data from DataForSEO Labs format
+                keyword = item.get("keyword", "")
                 keyword_info = item.get("keyword_info", {})
-                keyword_props = item.get("keyword_properties", {})
                 
-                keyword_data = {
-                    "keyword": item.get("keyword", ""),
+                append({
+                    "keyword": keyword,
                     "search_volume": keyword_info.get("search_volume", 0),
-                    "difficulty": keyword_props.get("keyword_difficulty", 0),
+                    "difficulty": item.get("keyword_properties", {}).get("keyword_difficulty", 0),
                     "cpc": keyword_info.get("cpc", 0.0),
                     "competition": keyword_info.get("competition", 0.0),
-                    "type": self._classify_keyword_type(item.get("keyword", ""))
-                }
-                keywords.append(keyword_data)
+                    "type": self._classify_keyword_type(keyword)
+                })
             
             return keywords
             
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (_json.JSONDecodeError, KeyError, TypeError) as e:
             print(f"Error processing keyword data: {e}")
             return []
     
     def _process_serp_data(self, raw_data: Dict) -> List[Dict[str, Any]]:
         """Process raw SERP data from MCP response"""
         serp_results = []
+        append = serp_results.append
         
         try:
-            # Parse the JSON text content from MCP response
-            if "content" in raw_data and raw_data["content"]:
-                content_text = raw_data["content"][0].get("text", "{}")
-                parsed_data = json.loads(content_text)
-                items = parsed_data.get("items", [])
-            else:
-                items = []
-            
-            # Process various SERP item types
+            # Process various SERP item types (add more builders as needed: people_also_ask, video, etc.)
             position = 1
-            for item in items:
-                item_type = item.get("type", "")
+            for item in tool_result_items(raw_data):
+                handler = _SERP_ITEM_BUILDERS.get(item.get("type", ""))
+                if handler is None:
+                    continue
                 
-                # Handle organic results
-                if item_type == "organic":
-                    result = {
-                        "position": item.get("rank_absolute", position),
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "description": item.get("description", ""),
-                        "domain": item.get("domain", ""),
-                        "type": "organic"
-                    }
-                    serp_results.append(result)
+                build, takes_position = handler
+                append(build(item, position))
+                if takes_position:
                     position += 1
-                
-                # Handle local pack results
-                elif item_type == "local_pack":
-                    result = {
-                        "position": item.get("rank_absolute", position),
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "description": item.get("description", ""),
-                        "domain": item.get("domain", ""),
-                        "type": "local_pack",
-                        "rating": item.get("rating", {}).get("value", 0),
-                        "phone": item.get("phone", "")
-                    }
-                    serp_results.append(result)
-                    position += 1
-                
-                # Handle featured snippets
-                elif item_type == "featured_snippet":
-                    result = {
-                        "position": 0,  # Featured snippets are always at the top
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "description": item.get("featured_title", ""),
-                        "domain": item.get("domain", ""),
-                        "type": "featured_snippet"
-                    }
-                    serp_results.append(result)
-                
-                # Add more types as needed (people_also_ask, video, etc.)
             
-            # Sort by position and limit to top 10
-            serp_results.sort(key=lambda x: x.get("position", 999))
-            return serp_results[:10]
+            # Top 10 by position (a partial sort: featured snippets and local packs can push the list past 10)
+            return heapq.nsmallest(10, serp_results, key=itemgetter("position"))
             
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (_json.JSONDecodeError, KeyError, TypeError) as e:
             print(f"Error processing SERP data: {e}")
             return []
     
     def _classify_keyword_type(self, keyword: str) -> str:
         """Classify keyword type"""
-        keyword_lower = keyword.lower()
-        
-        if any(q in keyword_lower for q in ["what", "how", "why", "when", "where"]):
-            return "Question"
-        elif any(c in keyword_lower for c in ["best", "top", "vs", "compare"]):
-            return "Comparison"
-        elif len(keyword.split()) >= 4:
-            return "Long-tail"
-        else:
-            return "Related"
+        return _keyword_type(keyword)
     
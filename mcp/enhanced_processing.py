@@ -1,50 +1,64 @@
 """
 Enhanced data processing methods for DataForSEO MCP responses
 """
-import json
-from typing import Dict, List, Any
-import random
+import sys
+from itertools import islice
+from typing import Dict, List, Any, Iterable
+from . import _json
+
+# Competition levels repeat on every search volume row: parsed values map onto these shared strings
+_COMPETITION_LEVELS = {level: sys.intern(level) for level in ("LOW", "MEDIUM", "HIGH", "UNKNOWN")}
+
+def tool_result_items(raw_data: Dict) -> Iterable[Dict[str, Any]]:
+    """
+    The "items" of an MCP tool result: from its structuredContent when the server sends one
+    (no parsing needed), otherwise from the JSON text of its first content block, streamed
+    item by item when large (empty when there are none)
+    """
+    structured = raw_data.get("structuredContent")
+    if isinstance(structured, dict):
+        return structured.get("items", [])
+    if raw_data.get("content"):
+        return _json.iter_items(raw_data["content"][0].get("text", "{}"))
+    return []
 
 def process_ranked_keywords_data(raw_data: Dict) -> List[Dict[str, Any]]:
     """Process ranked keywords data from MCP response"""
     keywords = []
+    append = keywords.append
     
     try:
-        if "content" in raw_data and raw_data["content"]:
-            content_text = raw_data["content"][0].get("text", "{}")
-            parsed_data = json.loads(content_text)
-            items = parsed_data.get("items", [])
-        else:
-            items = []
+        items = tool_result_items(raw_data)
         
         for item in items:
             keyword_data = item.get("keyword_data", {})
-            keyword_info = keyword_data.get("keyword_info", {})
             ranked_element = item.get("ranked_serp_element", {})
-            serp_item = ranked_element.get("serp_item", {})
+            # Bound .get of the two sub-dicts most fields come from (rows can number in the thousands)
+            info = keyword_data.get("keyword_info", {}).get
+            serp = ranked_element.get("serp_item", {}).get
             
-            result = {
+            append({
                 "keyword": keyword_data.get("keyword", ""),
-                "search_volume": keyword_info.get("search_volume", 0),
+                "search_volume": info("search_volume", 0),
                 "difficulty": ranked_element.get("keyword_difficulty", 0),
-                "cpc": keyword_info.get("cpc", 0.0),
-                "competition": keyword_info.get("competition", 0.0),
-                "position": serp_item.get("rank_absolute", 0),
-                "url": serp_item.get("url", ""),
-                "title": serp_item.get("title", ""),
-                "domain": serp_item.get("domain", ""),
-                "etv": serp_item.get("etv", 0.0),  # Estimated Traffic Value
-                "estimated_paid_traffic_cost": serp_item.get("estimated_paid_traffic_cost", 0.0),
-                "monthly_searches": keyword_info.get("monthly_searches", {}),
-                "rank_group": serp_item.get("rank_group", 0),  # SERP page number
-                "rank_changes": serp_item.get("rank_changes", {}),  # Position changes
+                "cpc": info("cpc", 0.0),
+                "competition": info("competition", 0.0),
+                "position": serp("rank_absolute", 0),
+                "url": serp("url", ""),
+                "title": serp("title", ""),
+                # Every row repeats the target's domain: one shared string instead of one per parsed row
+                "domain": sys.intern(serp("domain") or ""),
+                "etv": serp("etv", 0.0),  # Estimated Traffic Value
+                "estimated_paid_traffic_cost": serp("estimated_paid_traffic_cost", 0.0),
+                "monthly_searches": info("monthly_searches", {}),
+                "rank_group": serp("rank_group", 0),  # SERP page number
+                "rank_changes": serp("rank_changes", {}),  # Position changes
                 "type": "Ranked"
-            }
-            keywords.append(result)
+            })
         
         return keywords
         
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+    except (_json.JSONDecodeError, KeyError, TypeError) as e:
         print(f"Error processing ranked keywords data: {e}")
         return []
 
@@ -53,32 +67,28 @@ def process_competitor_data(raw_data: Dict) -> List[Dict[str, Any]]:
     competitors = []
     
     try:
-        if "content" in raw_data and raw_data["content"]:
-            content_text = raw_data["content"][0].get("text", "{}")
-            parsed_data = json.loads(content_text)
-            items = parsed_data.get("items", [])
-        else:
-            items = []
+        items = tool_result_items(raw_data)
         
         # Skip the first item (it's the target domain, not a competitor)
-        for item in items[1:]:  # Start from index 1
-            metrics = item.get("metrics", {})
-            organic = metrics.get("organic", {})
+        for item in islice(items, 1, None):  # Start from index 1
+            organic = item.get("metrics", {}).get("organic", {})
+            intersections = item.get("intersections", 0)
+            keyword_count = organic.get("count", 0)
             
             competitor = {
-                "domain": item.get("domain", ""),
-                "common_keywords": item.get("intersections", 0),  # Use intersections for common keywords
-                "se_keywords": organic.get("count", 0),
+                "domain": sys.intern(item.get("domain") or ""),
+                "common_keywords": intersections,  # Use intersections for common keywords
+                "se_keywords": keyword_count,
                 "estimated_traffic": organic.get("etv", 0),
                 "avg_position": item.get("avg_position", 0),  # avg_position is at item level
                 "visibility": organic.get("visibility", 0.0),
-                "relevance": round(item.get("intersections", 0) / max(organic.get("count", 1), 1), 3)  # Calculate relevance
+                "relevance": round(intersections / max(keyword_count, 1), 3)  # Calculate relevance
             }
             competitors.append(competitor)
         
         return competitors
         
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+    except (_json.JSONDecodeError, KeyError, TypeError) as e:
         print(f"Error processing competitor data: {e}")
         return []
 
@@ -87,23 +97,19 @@ def process_search_volume_data(raw_data: Dict) -> List[Dict[str, Any]]:
     results = []
     
     try:
-        if "content" in raw_data and raw_data["content"]:
-            content_text = raw_data["content"][0].get("text", "{}")
-            parsed_data = json.loads(content_text)
-            items = parsed_data.get("items", [])
-        else:
-            items = []
+        items = tool_result_items(raw_data)
         
         for item in items:
             # DataForSEO ads search volume response structure
             monthly_searches = item.get("monthly_searches", [])
+            competition_level = item.get("competition_index", "UNKNOWN")
             
             result = {
                 "keyword": item.get("keyword", ""),
                 "search_volume": item.get("search_volume", 0),
                 "cpc": item.get("cpc", 0.0),
                 "competition": item.get("competition", 0.0),
-                "competition_level": item.get("competition_index", "UNKNOWN"),
+                "competition_level": _COMPETITION_LEVELS.get(competition_level, competition_level),
                 "monthly_searches": monthly_searches,
                 "low_bid": item.get("low_top_of_page_bid", 0.0),
                 "high_bid": item.get("high_top_of_page_bid", 0.0)
@@ -112,7 +118,7 @@ def process_search_volume_data(raw_data: Dict) -> List[Dict[str, Any]]:
         
         return results
         
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+    except (_json.JSONDecodeError, KeyError, TypeError) as e:
         print(f"Error processing search volume data: {e}")
         return []
 
@@ -120,12 +126,7 @@ def process_trends_data(raw_data: Dict) -> Dict[str, Any]:
     """Process Google Trends data from MCP response"""
     
     try:
-        if "content" in raw_data and raw_data["content"]:
-            content_text = raw_data["content"][0].get("text", "{}")
-            parsed_data = json.loads(content_text)
-            items = parsed_data.get("items", [])
-        else:
-            items = []
+        items = tool_result_items(raw_data)
         
         trends_data = {
             "keywords": [],
@@ -138,26 +139,17 @@ def process_trends_data(raw_data: Dict) -> Dict[str, Any]:
             if item.get("type") == "google_trends_graph":
                 # Extract keywords and graph data
                 trends_data["keywords"] = item.get("keywords", [])
-                raw_data_points = item.get("data", [])
                 
-                # Convert to the expected format with date and value
-                graph_data = []
-                for point in raw_data_points:
-                    if isinstance(point, dict):
-                        # Skip points with missing data
-                        if point.get("missing_data", False):
-                            continue
-                            
-                        # Extract date and value from DataForSEO format
-                        date = point.get("date_from", "")
-                        values = point.get("values", [])
-                        value = values[0] if values and len(values) > 0 else 0
-                        
-                        if date:
-                            graph_data.append({
-                                "date": date,
-                                "value": value
-                            })
+                # Convert to the expected format with date and value, skipping points with
+                # missing data or no date (one comprehension, no per-point appends)
+                graph_data = [
+                    {
+                        "date": point["date_from"],
+                        "value": point["values"][0] if point.get("values") else 0
+                    }
+                    for point in item.get("data", [])
+                    if isinstance(point, dict) and not point.get("missing_data", False) and point.get("date_from")
+                ]
                 
                 trends_data["graph_data"] = graph_data
                 
@@ -168,7 +160,7 @@ def process_trends_data(raw_data: Dict) -> Dict[str, Any]:
         
         return trends_data
         
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+    except (_json.JSONDecodeError, KeyError, TypeError) as e:
         print(f"Error processing trends data: {e}")
         return {"keywords": [], "graph_data": [], "related_queries": [], "rising_queries": []}
 
@@ -176,7 +168,14 @@ def process_content_analysis_data(raw_data: Dict) -> Dict[str, Any]:
     """Process content analysis data from MCP response"""
     
     try:
-        if "content" in raw_data and raw_data["content"]:
+        if isinstance(raw_data.get("structuredContent"), dict):
+            parsed_data = raw_data["structuredContent"]
+            if parsed_data.get("status_code") != 20000:
+                error_msg = parsed_data.get('status_message', 'Unknown error')
+                print(f"DataForSEO API error: {error_msg}")
+                raise Exception(f"DataForSEO API error: {error_msg}")
+            items = parsed_data.get("items", [])
+        elif "content" in raw_data and raw_data["content"]:
             content_text = raw_data["content"][0].get("text", "{}")
             
             # Check for API errors first
@@ -191,8 +190,8 @@ def process_content_analysis_data(raw_data: Dict) -> Dict[str, Any]:
             
             # Try to parse JSON with better error handling
             try:
-                parsed_data = json.loads(content_text)
-            except json.JSONDecodeError as json_err:
+                parsed_data = _json.loads(content_text)
+            except _json.JSONDecodeError as json_err:
                 print(f"JSON decode error: {json_err}")
                 print(f"Content text (first 200 chars): {content_text[:200]}")
                 raise Exception(f"Invalid JSON response from MCP: {json_err}")
@@ -265,7 +264,7 @@ def process_content_analysis_data(raw_data: Dict) -> Dict[str, Any]:
         
         raise Exception("No items found in content analysis response")
         
-    except (json.JSONDecodeError, KeyError, TypeError) as e:
+    except (_json.JSONDecodeError, KeyError, TypeError) as e:
         print(f"Error processing content analysis data: {e}")
         raise Exception(f"Content analysis processing failed: {e}")
 
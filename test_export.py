@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test the CSV export's columns and formatting (no API credentials needed)
+
+Runs as a script or under pytest.
+"""
+import pandas as pd
+
+from utils.export import export_to_csv
+
+def test_csv_keeps_columns_missing_from_first_row():
+    rows = [
+        {'keyword': 'a', 'search_volume': 10},
+        {'keyword': 'b', 'search_volume': 20, 'cpc': 1.5}
+    ]
+    assert export_to_csv(rows) == "Keyword,Search Volume,Cpc\na,10,$0.00\nb,20,$1.50\n"
+
+def test_csv_same_output_for_list_and_dataframe():
+    rows = [
+        {'keyword': 'seo, tools', 'search_volume': 1000, 'difficulty': 5, 'competition': 0.33, 'type': 'Related'},
+        {'keyword': 'seo audit', 'search_volume': 90, 'difficulty': 12, 'competition': 1e-07, 'type': 'Question'}
+    ]
+    expected = (
+        "Keyword,Search Volume,Difficulty,Competition,Type\n"
+        '"seo, tools","1,000",5%,0.33,Related\n'
+        "seo audit,90,12%,1e-07,Question\n"
+    )
+    df = pd.DataFrame(rows)
+    assert export_to_csv(rows) == expected
+    assert export_to_csv(df) == expected
+    # The caller's DataFrame is left as it was
+    assert list(df.columns) == ['keyword', 'search_volume', 'difficulty', 'competition', 'type']
+
+if __name__ == "__main__":
+    print('TESTING CSV EXPORT')
+    print('='*60)
+    tests = [
+        test_csv_keeps_columns_missing_from_first_row,
+        test_csv_same_output_for_list_and_dataframe
+    ]
+    for test in tests:
+        test()
+        print(f'✅ {test.__name__}')
+    print('\nAll CSV export tests passed')
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test the pooled MCP stdio transport against a small fake MCP server (no API credentials needed)
+
+Covers response matching by id, skipping of server log lines and server-to-client requests, the MAX_IN_FLIGHT limit,
+resending calls lost to a server that exited, and the instance pool's reuse, discard,
+per-key process starts and per-call references.
+Runs as a script or under pytest.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from mcp import _disk_cache, _pool
+from mcp._pool import MCPConnection, McpInstancePool, config_hash
+from mcp.client import MCPClient
+
+# Answers tools/call "sleep" after `seconds` on its own thread (so replies come back out of
+# order), prints a log line and a server-to-client request with the same id before every
+# reply, records how many calls it works on at once and exits with code 4 on the first
+# "exit_once" call while its marker file doesn't exist
+FAKE_SERVER = r'''
+import json, os, sys, threading, time
+
+lock = threading.Lock()
+active = 0
+peak = 0
+
+def reply(message):
+    with lock:
+        sys.stdout.write("fake server log line\n")
+        # A server-to-client request reusing the reply's id, which must not be taken for the reply
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": message["id"], "method": "ping"}) + "\n")
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+def call(request):
+    global active, peak
+    name = request["params"]["name"]
+    arguments = request["params"].get("arguments", {})
+    with lock:
+        active += 1
+        peak = max(peak, active)
+    time.sleep(arguments.get("seconds", 0))
+    with lock:
+        active -= 1
+        current_peak = peak
+    text = json.dumps({"name": name, "arguments": arguments, "peak": current_peak})
+    reply({"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": text}]}})
+
+for line in sys.stdin:
+    request = json.loads(line)
+    method = request.get("method")
+    if "id" not in request:
+        continue
+    if method == "initialize":
+        reply({"jsonrpc": "2.0", "id": request["id"], "result": {"protocolVersion": "2024-11-05", "capabilities": {}}})
+    elif method == "tools/list":
+        tools = [{"name": "sleep"}, {"name": "exit_once"}]
+        reply({"jsonrpc": "2.0", "id": request["id"], "result": {"tools": tools}})
+    elif method == "tools/call":
+        if request["params"]["name"] == "exit_once":
+            marker = request["params"]["arguments"]["marker"]
+            if not os.path.exists(marker):
+                open(marker, "w").close()
+                os._exit(4)
+        threading.Thread(target=call, args=(request,), daemon=True).start()
+'''
+
+_workdir = tempfile.mkdtemp(prefix="fake-mcp-")
+SERVER_PATH = os.path.join(_workdir, "server.py")
+with open(SERVER_PATH, "w") as f:
+    f.write(FAKE_SERVER)
+
+# Keep the tests' results out of the real on-disk result cache
+_disk_cache.CACHE_DIR = Path(_workdir) / "cache"
+
+def _call_text(response):
+    return json.loads(response["result"]["content"][0]["text"])
+
+def _connection() -> MCPConnection:
+    connection = MCPConnection(sys.executable, [SERVER_PATH], {})
+    connection.initialize(10)
+    return connection
+
+def test_responses_matched_by_id():
+    connection = _connection()
+    try:
+        # The first call sleeps longest, so its reply arrives last
+        responses = connection.request_many("tools/call", [
+            {"name": "sleep", "arguments": {"seconds": delay, "tag": tag}}
+            for tag, delay in enumerate([0.6, 0.3, 0.0])
+        ], 10)
+        assert [_call_text(response)["arguments"]["tag"] for response in responses] == [0, 1, 2]
+
+        single = connection.request("tools/call", {"name": "sleep", "arguments": {"tag": "one"}}, 10)
+        assert _call_text(single)["arguments"]["tag"] == "one"
+    finally:
+        connection.close()
+
+def test_in_flight_limit():
+    connection = _connection()
+    try:
+        count = _pool.MAX_IN_FLIGHT + 4
+        started = time.monotonic()
+        responses = connection.request_many("tools/call", [
+            {"name": "sleep", "arguments": {"seconds": 0.4, "tag": tag}} for tag in range(count)
+        ], 10)
+        elapsed = time.monotonic() - started
+
+        assert all(isinstance(response, dict) for response in responses)
+        assert max(_call_text(response)["peak"] for response in responses) <= _pool.MAX_IN_FLIGHT
+        # The calls beyond the limit waited for a slot: two rounds of 0.4s
+        assert elapsed >= 0.8
+        # Every slot was given back
+        assert all(connection._in_flight.acquire(blocking=False) for _ in range(_pool.MAX_IN_FLIGHT))
+    finally:
+        connection.close()
+
+def test_server_exit_fails_waiting_requests():
+    connection = _connection()
+    try:
+        marker = os.path.join(_workdir, "exit-direct")
+        responses = connection.request_many("tools/call", [
+            {"name": "exit_once", "arguments": {"marker": marker}}
+        ], 10)
+        assert isinstance(responses[0], ConnectionError)
+        assert "code 4" in str(responses[0])
+        assert not connection.alive
+    finally:
+        connection.close()
+
+def test_call_resent_after_server_exit():
+    client = MCPClient()
+    args = [SERVER_PATH]
+    client.servers["fake"] = {"command": sys.executable, "args": args, "env": {}, "config_hash": config_hash(sys.executable, args, {})}
+    try:
+        marker = os.path.join(_workdir, "exit-resend")
+        result = client.call_tool("fake", "exit_once", {"marker": marker})
+        assert "error" not in result, result
+        assert _call_text({"result": result})["name"] == "exit_once"
+        assert os.path.exists(marker)
+    finally:
+        client.close()
+
+def test_pool_reuses_and_discards():
+    pool = McpInstancePool()
+    try:
+        first = pool.acquire("key", 1, _connection)
+        assert pool.acquire("key", 2, _connection) is first
+
+        pool.discard("key", first)
+        assert not first.alive
+        second = pool.acquire("key", 1, _connection)
+        assert second is not first and second.alive
+    finally:
+        pool.close_all()
+
+def test_pool_start_does_not_block_other_keys():
+    pool = McpInstancePool()
+    release_start = threading.Event()
+
+    def slow_start() -> MCPConnection:
+        release_start.wait(10)
+        return _connection()
+
+    try:
+        starter = threading.Thread(target=pool.acquire, args=("slow", 1, slow_start))
+        starter.start()
+        time.sleep(0.2)
+        # The slow key's start is still running; another key starts and releases meanwhile
+        started = time.monotonic()
+        pool.acquire("fast", 1, _connection)
+        pool.release("fast", 1)
+        assert time.monotonic() - started < 5
+        assert starter.is_alive()
+
+        release_start.set()
+        starter.join(10)
+        # A second caller for the slow key gets the connection started by the first
+        assert pool.acquire("slow", 2, _connection) is pool._entries["slow"]["connection"]
+    finally:
+        release_start.set()
+        pool.close_all()
+
+def test_client_releases_reference_after_call():
+    client = MCPClient()
+    args = [SERVER_PATH, "release"]
+    key = config_hash(sys.executable, args, {})
+    client.servers["fake"] = {"command": sys.executable, "args": args, "env": {}, "config_hash": key}
+    try:
+        result = client.call_tool("fake", "sleep", {"tag": "release"})
+        assert "error" not in result, result
+        # No reference outlives the call: the pooled process is already counting down to idle
+        entry = _pool.pool._entries[key]
+        assert not entry["refs"] and entry["idle_timer"] is not None
+        assert not client.active_connections
+    finally:
+        client.close()
+        _pool.pool.close_all()
+
+if __name__ == "__main__":
+    print('TESTING MCP CONNECTION POOL')
+    print('='*60)
+    tests = [
+        test_responses_matched_by_id,
+        test_in_flight_limit,
+        test_server_exit_fails_waiting_requests,
+        test_call_resent_after_server_exit,
+        test_pool_reuses_and_discards,
+        test_pool_start_does_not_block_other_keys,
+        test_client_releases_reference_after_call
+    ]
+    for test in tests:
+        test()
+        print(f'✅ {test.__name__}')
+    print('\nAll MCP pool tests passed')
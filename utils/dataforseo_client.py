@@ -6,6 +6,7 @@ Direct API integration for Streamlit Cloud compatibility
 import os
 import requests
 import base64
+from urllib.parse import urlparse
 from typing import List, Dict, Any, Optional
 
 
@@ -232,7 +233,6 @@ class DataForSEOClient:
         """Get competitor domains via REST API"""
         
         # Clean domain
-        from urllib.parse import urlparse
         parsed = urlparse(target_domain if target_domain.startswith('http') else f'https://{target_domain}')
         clean_domain = parsed.netloc or parsed.path
         clean_domain = clean_domain.replace('www.', '')
@@ -275,7 +275,6 @@ class DataForSEOClient:
         """Get keywords a domain ranks for via REST API"""
         
         # Clean domain
-        from urllib.parse import urlparse
         parsed = urlparse(target_domain if target_domain.startswith('http') else f'https://{target_domain}')
         clean_domain = parsed.netloc or parsed.path
         clean_domain = clean_domain.replace('www.', '')
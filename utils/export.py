@@ -1,7 +1,24 @@
 import pandas as pd
 import io
+import gzip
+import json
 from typing import Union, List, Dict
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library
+    orjson = None
+
+# Display formatting for the CSV export, with the value written for missing cells
+_CSV_COLUMN_FORMATS = {
+    'Search Volume': (lambda x: f"{x:,}", "0"),
+    'Cpc': (lambda x: f"${x:.2f}", "$0.00"),
+    'Difficulty': (lambda x: f"{x}%", "0%")
+}
+
+def _clean_column_name(col: str) -> str:
+    return col.replace('_', ' ').title()
+
 def export_to_csv(data: Union[pd.DataFrame, List[Dict]]) -> str:
     """
     Export data to CSV format
@@ -17,20 +34,15 @@ def export_to_csv(data: Union[pd.DataFrame, List[Dict]]) -> str:
         if isinstance(data, list):
             df = pd.DataFrame(data)
         else:
-            df = data
+            df = data.copy()
         
         # Clean column names
-        df.columns = [col.replace('_', ' ').title() for col in df.columns]
+        df.columns = [_clean_column_name(col) for col in df.columns]
         
         # Format specific columns
-        if 'Search Volume' in df.columns:
-            df['Search Volume'] = df['Search Volume'].apply(lambda x: f"{x:,}" if pd.notnull(x) else "0")
-        
-        if 'Cpc' in df.columns:
-            df['Cpc'] = df['Cpc'].apply(lambda x: f"${x:.2f}" if pd.notnull(x) else "$0.00")
-        
-        if 'Difficulty' in df.columns:
-            df['Difficulty'] = df['Difficulty'].apply(lambda x: f"{x}%" if pd.notnull(x) else "0%")
+        for name, (formatter, missing) in _CSV_COLUMN_FORMATS.items():
+            if name in df.columns:
+                df[name] = df[name].apply(lambda x: formatter(x) if pd.notnull(x) else missing)
         
         # Convert to CSV
         return df.to_csv(index=False)
@@ -133,26 +145,48 @@ def export_to_excel(data: Union[pd.DataFrame, List[Dict]]) -> bytes:
         buffer.seek(0)
         return buffer.getvalue()
 
-def export_to_json(data: Union[pd.DataFrame, List[Dict]]) -> str:
+def export_to_json(data: Union[pd.DataFrame, List[Dict], Dict], indent: bool = True) -> bytes:
     """
     Export data to JSON format
     
     Args:
-        data: DataFrame or list of dictionaries to export
+        data: DataFrame, list of dictionaries or report dictionary to export
+        indent: Pretty-print with 2-space indentation (compact output when False)
         
     Returns:
-        JSON string data
+        JSON as UTF-8 bytes, ready for st.download_button
     """
     try:
         if isinstance(data, pd.DataFrame):
-            return data.to_json(orient='records', indent=2)
-        else:
-            import json
-            return json.dumps(data, indent=2)
+            return data.to_json(orient='records', indent=2 if indent else None, force_ascii=False).encode('utf-8')
+        
+        # orjson serializes straight to bytes in C; anything it rejects goes through json
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            try:
+                return orjson.dumps(data, option=option)
+            except TypeError:
+                pass
+        
+        if indent:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
             
     except Exception as e:
         raise Exception(f"JSON export failed: {str(e)}")
 
+def export_to_json_gzip(data: Union[pd.DataFrame, List[Dict], Dict]) -> bytes:
+    """
+    Export data as gzip-compressed compact JSON (.json.gz)
+    
+    Args:
+        data: DataFrame, list of dictionaries or report dictionary to export
+        
+    Returns:
+        Gzipped JSON bytes
+    """
+    return gzip.compress(export_to_json(data, indent=False), compresslevel=6, mtime=0)
+
 def create_keyword_report(
     keywords: List[Dict],
     seed_keyword: str,
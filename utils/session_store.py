@@ -0,0 +1,70 @@
+"""
+On-disk store for per-session Content Generator chat logs
+
+The full chat log is appended to a JSON-lines file per session so only a short
+window has to stay in Streamlit session state; the rest is read back on demand.
+"""
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+SESSIONS_DIR = Path(__file__).resolve().parent.parent / "data" / "sessions"
+
+# Session files untouched for this long are removed by cleanup_expired_sessions(). Live sessions
+# touch their log on every run, but a browser tab can sit idle (no runs at all) for hours and
+# still come back to its chat, so this is well above any realistic idle period.
+SESSION_TTL_SECONDS = 24 * 3600
+
+def new_session_id() -> str:
+    """Create a random id for a new browser session"""
+    return uuid.uuid4().hex
+
+def _chat_log_path(session_id: str) -> Path:
+    return SESSIONS_DIR / f"{session_id}.chat.jsonl"
+
+def append_chat_message(session_id: str, message: Dict[str, str]) -> None:
+    """Append one chat message to the session's chat log (only the new message is written)"""
+    try:
+        SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_chat_log_path(session_id), "a", encoding="utf-8") as f:
+            f.write(json.dumps(message, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Session store write failed: {e}")
+
+def load_chat_history(session_id: str) -> List[Dict[str, str]]:
+    """Full chat log of a session, oldest message first"""
+    try:
+        with open(_chat_log_path(session_id), encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, json.JSONDecodeError):
+        return []
+
+def touch_session(session_id: str) -> None:
+    """Mark the session's chat log as in use, so cleanup_expired_sessions() keeps it"""
+    try:
+        os.utime(_chat_log_path(session_id))
+    except OSError:  # no chat log yet
+        pass
+
+def clear_chat_history(session_id: str) -> None:
+    """Delete the session's chat log"""
+    _chat_log_path(session_id).unlink(missing_ok=True)
+
+def cleanup_expired_sessions(ttl_seconds: int = SESSION_TTL_SECONDS) -> int:
+    """Remove session files idle for longer than `ttl_seconds`; returns how many were removed"""
+    if not SESSIONS_DIR.is_dir():
+        return 0
+
+    cutoff = time.time() - ttl_seconds
+    removed = 0
+    for path in SESSIONS_DIR.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed